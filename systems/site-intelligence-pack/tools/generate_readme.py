@@ -19,7 +19,7 @@ def generate_readme(pack: dict) -> str:
     
     meta = pack.get("run_metadata", {})
     pages_crawled = meta.get("pages_crawled", 0)
-    pages_extracted = len(pack.get("deep_extract_notes", {}).get("pages_extracted", 0))
+    pages_extracted = pack.get("deep_extract_notes", {}).get("pages_extracted", 0)
     
     findings = pack.get("synthesized_findings", {})
     
@@ -29,12 +29,11 @@ def create_issue(repo: str, title: str, body: str, labels: list = None) -> dict:
         "labels": labels or ["site-intelligence-pack", "failed-run"]
     }
     
-    resp = httpx.post(
-        f"https://api.github.com/repos/{repo}/issues",
-        headers=headers,
-        json=payload,
-        timeout=15
-    )
+    with httpx.Client(headers=headers, http2=True, timeout=15) as client:
+        resp = client.post(
+            f"https://api.github.com/repos/{repo}/issues",
+            json=payload
+        )
     resp.raise_for_status()
     
     data = resp.json()
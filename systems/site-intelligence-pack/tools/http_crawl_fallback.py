@@ -12,7 +12,8 @@ import json
 import argparse
 import logging
 import time
-from typing import List, Dict, Set
+from collections import deque
+from typing import List, Dict, Sequence, Set
 from urllib.parse import urljoin, urlparse
 import httpx
 from bs4 import BeautifulSoup
@@ -23,13 +24,56 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Maximum characters of page text kept per crawled page
+MAX_CONTENT_CHARS = 10000
 
-def is_path_allowed(url_path: str, disallowed_paths: List[str]) -> bool:
-    """Check if a URL path is allowed by robots.txt."""
-    for disallowed in disallowed_paths:
-        if url_path.startswith(disallowed):
-            return False
-    return True
+# Maximum new links queued from a single page (megamenus and sitemaps can
+# emit thousands); the highest-scoring links are kept
+MAX_LINKS_PER_PAGE = 50
+
+# Politeness floor between requests (5 requests/second); the crawler only
+# sleeps for whatever part of the interval the previous fetch didn't use
+MIN_REQUEST_INTERVAL = 0.2
+
+# Responses that mean "slow down / try again" rather than "skip this page"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 2
+MAX_RETRY_DELAY = 30.0
+
+# Path keywords that mark a link as likely high-value for the pack
+PRIORITY_PATH_KEYWORDS = (
+    "pricing", "plans", "faq", "about", "contact", "privacy", "terms",
+    "careers", "blog", "features", "product", "testimonial", "review"
+)
+
+
+def is_path_allowed(url_path: str, disallowed_paths: Sequence[str]) -> bool:
+    """
+    Check if a URL path is allowed by robots.txt.
+
+    Pass a tuple to avoid a copy per call; str.startswith matches every
+    prefix in a single C-level call.
+    """
+    return not url_path.startswith(tuple(disallowed_paths))
+
+
+def extract_text(soup: BeautifulSoup, limit: int = MAX_CONTENT_CHARS) -> str:
+    """
+    Extract newline-separated visible text, stopping once `limit` is reached.
+
+    Produces the same text as a newline-separated, stripped ``get_text()``
+    truncated to `limit`, without materializing the rest of a long page.
+    """
+    parts = []
+    total = 0
+    for string in soup.stripped_strings:
+        parts.append(string)
+        total += len(string) + 1
+        # total counts a separator after every part; the joined text is
+        # one shorter, so stop only once that reaches the limit
+        if total - 1 >= limit:
+            break
+    return '\n'.join(parts)[:limit]
 
 
 def extract_links(html: str, base_url: str) -> List[str]:
@@ -45,6 +89,56 @@ def extract_links(html: str, base_url: str) -> List[str]:
     return links
 
 
+def retry_delay(resp: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying, honoring a numeric Retry-After header."""
+    try:
+        delay = float(resp.headers.get("retry-after", ""))
+    except ValueError:
+        delay = 2.0 ** attempt
+    return min(max(delay, 0.0), MAX_RETRY_DELAY)
+
+
+def fetch_with_backoff(client: httpx.Client, url: str) -> httpx.Response:
+    """
+    GET a URL, backing off and retrying on rate-limit and transient 5xx responses.
+    
+    Returns the last response received; callers decide what to do with any
+    status that is still not 200 after MAX_RETRIES retries.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        resp = client.get(url)
+        if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            return resp
+        
+        delay = retry_delay(resp, attempt)
+        logger.warning(f"Got {resp.status_code} for {url}, retrying in {delay:.1f}s")
+        time.sleep(delay)
+    
+    return resp
+
+
+def score_link(link: str, domain: str) -> int:
+    """
+    Cheap relevance heuristic used to pick which discovered links to queue.
+
+    On-domain links and links whose path contains a priority keyword score
+    higher; deeper paths score lower.
+    """
+    parsed = urlparse(link)
+    score = 0
+    
+    if parsed.netloc == domain or parsed.netloc.endswith(f".{domain}"):
+        score += 10
+    
+    path = parsed.path.lower()
+    score -= path.strip("/").count("/")
+    
+    if any(keyword in path for keyword in PRIORITY_PATH_KEYWORDS):
+        score += 5
+    
+    return score
+
+
 def crawl_http_fallback(
     domain: str,
     max_pages: int = 200,
@@ -61,15 +155,17 @@ def crawl_http_fallback(
     Returns:
         List of page dicts with url, title, content, status, discovered_from
     """
-    disallowed = disallowed_paths or []
+    disallowed = tuple(disallowed_paths or ())
     base_url = f"https://{domain}"
     
-    to_visit = [base_url]
-    visited: Set[str] = set()
+    # FIFO queue plus one set of every URL ever queued: each URL is queued at
+    # most once, so a link is checked against a single hash set rather than
+    # a separate set of fetched URLs and a linear scan of the queue
+    to_visit = deque()
+    seen: Set[str] = set()
     pages = []
     
-    # Rate limiting: 1 request per second
-    rate_limit_delay = 1.0
+    last_request_at = 0.0
     
     # Try some common important paths explicitly
     common_paths = [
@@ -77,95 +173,100 @@ def crawl_http_fallback(
         "/privacy", "/terms", "/careers", "/blog"
     ]
     
-    for path in common_paths:
-        to_visit.append(f"{base_url}{path}")
+    for url in [base_url] + [f"{base_url}{path}" for path in common_paths]:
+        if url not in seen:
+            seen.add(url)
+            to_visit.append(url)
     
     logger.info(f"Starting HTTP fallback crawl for {domain}")
     
-    while to_visit and len(pages) < max_pages:
-        url = to_visit.pop(0)
-        
-        # Skip if already visited
-        if url in visited:
-            continue
-        
-        # Check robots.txt compliance
-        parsed = urlparse(url)
-        if not is_path_allowed(parsed.path, disallowed):
-            logger.debug(f"Skipping disallowed: {url}")
-            visited.add(url)
-            continue
-        
-        # Skip non-HTTP(S) URLs
-        if parsed.scheme not in ("http", "https"):
-            visited.add(url)
-            continue
-        
-        # Skip different domains
-        if parsed.netloc != domain and not parsed.netloc.endswith(f".{domain}"):
-            visited.add(url)
-            continue
-        
-        visited.add(url)
-        
-        try:
-            # Rate limiting
-            time.sleep(rate_limit_delay)
+    # One pooled client for the whole crawl: every page is on the same host,
+    # so keep-alive (and HTTP/2 where offered) skips a handshake per request
+    with httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        timeout=15,
+        headers={"User-Agent": "Mozilla/5.0 (compatible; SiteIntelligencePack/1.0)"},
+        limits=httpx.Limits(max_keepalive_connections=20)
+    ) as client:
+        while to_visit and len(pages) < max_pages:
+            url = to_visit.popleft()
             
-            logger.info(f"Fetching ({len(pages)+1}/{max_pages}): {url}")
-            
-            resp = httpx.get(
-                url,
-                follow_redirects=True,
-                timeout=15,
-                headers={"User-Agent": "Mozilla/5.0 (compatible; SiteIntelligencePack/1.0)"}
-            )
-            
-            # Skip non-200 responses
-            if resp.status_code != 200:
-                logger.warning(f"Skipping {url} (status {resp.status_code})")
+            # Check robots.txt compliance (skipped outright when robots.txt
+            # disallows nothing, which is the common case)
+            parsed = urlparse(url)
+            if disallowed and not is_path_allowed(parsed.path, disallowed):
+                logger.debug(f"Skipping disallowed: {url}")
                 continue
             
-            # Skip non-HTML content
-            content_type = resp.headers.get("content-type", "")
-            if "text/html" not in content_type.lower():
-                logger.debug(f"Skipping non-HTML: {url}")
+            # Skip non-HTTP(S) URLs
+            if parsed.scheme not in ("http", "https"):
                 continue
             
-            html = resp.text
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Extract title
-            title_tag = soup.find('title')
-            title = title_tag.string if title_tag else ""
-            
-            # Extract text content (simplified markdown)
-            for script_or_style in soup(['script', 'style']):
-                script_or_style.extract()
-            
-            text_content = soup.get_text(separator='\n', strip=True)
+            # Skip different domains
+            if parsed.netloc != domain and not parsed.netloc.endswith(f".{domain}"):
+                continue
             
-            pages.append({
-                "url": url,
-                "title": title,
-                "content": text_content[:10000],  # Limit content size
-                "status": resp.status_code,
-                "discovered_from": "http_crawl"
-            })
+            try:
+                # Rate limiting: only wait out the unused part of the interval
+                wait = MIN_REQUEST_INTERVAL - (time.monotonic() - last_request_at)
+                if wait > 0:
+                    time.sleep(wait)
+                last_request_at = time.monotonic()
+                
+                logger.info(f"Fetching ({len(pages)+1}/{max_pages}): {url}")
+                
+                resp = fetch_with_backoff(client, url)
+                
+                # Skip non-200 responses
+                if resp.status_code != 200:
+                    logger.warning(f"Skipping {url} (status {resp.status_code})")
+                    continue
+                
+                # Skip non-HTML content
+                content_type = resp.headers.get("content-type", "")
+                if "text/html" not in content_type.lower():
+                    logger.debug(f"Skipping non-HTML: {url}")
+                    continue
+                
+                html = resp.text
+                soup = BeautifulSoup(html, 'html.parser')
+                
+                # Extract title
+                title_tag = soup.find('title')
+                title = title_tag.string if title_tag else ""
+                
+                # Extract text content (simplified markdown)
+                for script_or_style in soup(['script', 'style']):
+                    script_or_style.extract()
+                
+                text_content = extract_text(soup)
+                
+                pages.append({
+                    "url": url,
+                    "title": title,
+                    "content": text_content,
+                    "status": resp.status_code,
+                    "discovered_from": "http_crawl"
+                })
+                
+                # Extract and queue new links (only if we have room)
+                if len(pages) < max_pages:
+                    new_links = [
+                        link for link in dict.fromkeys(extract_links(html, url))
+                        if link not in seen
+                    ]
+                    new_links.sort(key=lambda link: score_link(link, domain), reverse=True)
+                    new_links = new_links[:MAX_LINKS_PER_PAGE]
+                    seen.update(new_links)
+                    to_visit.extend(new_links)
             
-            # Extract and queue new links (only if we have room)
-            if len(pages) < max_pages:
-                new_links = extract_links(html, url)
-                for link in new_links:
-                    if link not in visited and link not in to_visit:
-                        to_visit.append(link)
-        
-        except httpx.HTTPError as e:
-            logger.warning(f"HTTP error fetching {url}: {e}")
-            continue
-        except Exception as e:
-            logger.warning(f"Error fetching {url}: {e}")
-            continue
+            except httpx.HTTPError as e:
+                logger.warning(f"HTTP error fetching {url}: {e}")
+                continue
+            except Exception as e:
+                logger.warning(f"Error fetching {url}: {e}")
+                continue
     
     logger.info(f"HTTP fallback crawl completed: {len(pages)} pages")
     
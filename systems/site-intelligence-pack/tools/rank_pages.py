@@ -57,6 +57,40 @@ TITLE_KEYWORDS = {
     "contact": ["contact", "get in touch"]
 }
 
+def _build_category_index() -> List[Tuple[str, int, List[Tuple[str, str]], List[Tuple[str, str]], int]]:
+    """
+    Build the keyword index used by categorize_page, in descending priority.
+    
+    Each entry is (category, path_score, path_entries, title_entries, ceiling)
+    where the entries are (keyword, reason) pairs and ceiling is the best score
+    this or any lower-priority category can still award. Category and reason
+    strings are interned so every matching page shares one copy.
+    """
+    index = []
+    for category in sorted(CATEGORIES, key=CATEGORIES.get, reverse=True):
+        path_entries = [
+            (keyword, sys.intern(f"Path contains '{keyword}'"))
+            for keyword in PATH_KEYWORDS.get(category, [])
+        ]
+        title_entries = [
+            (keyword, sys.intern(f"Title contains '{keyword}'"))
+            for keyword in TITLE_KEYWORDS.get(category, [])
+        ]
+        if path_entries or title_entries:
+            index.append((sys.intern(category), CATEGORIES[category], path_entries, title_entries))
+    
+    ceiling = 0
+    with_ceilings = []
+    for category, score, path_entries, title_entries in reversed(index):
+        ceiling = max(ceiling, score + 10 if title_entries else score)
+        with_ceilings.append((category, score, path_entries, title_entries, ceiling))
+    with_ceilings.reverse()
+    return with_ceilings
+
+
+# Built once at import so the per-page scan does no dict lookups or formatting
+_CATEGORY_INDEX = _build_category_index()
+
 
 def categorize_page(url: str, title: str) -> Tuple[str, int, List[str]]:
     """
@@ -72,25 +106,26 @@ def categorize_page(url: str, title: str) -> Tuple[str, int, List[str]]:
     max_score = 0
     best_category = "other"
     
-    # Check path keywords
-    for category, keywords in PATH_KEYWORDS.items():
-        for keyword in keywords:
+    for category, score, path_entries, title_entries, ceiling in _CATEGORY_INDEX:
+        # Nothing from here down can beat the current best match
+        if max_score >= ceiling:
+            break
+        
+        # Check path keywords
+        for keyword, reason in path_entries:
             if keyword in url_lower:
-                score = CATEGORIES[category]
                 if score > max_score:
                     max_score = score
                     best_category = category
-                reasons.append(f"Path contains '{keyword}'")
-    
-    # Check title keywords (boost score slightly)
-    for category, keywords in TITLE_KEYWORDS.items():
-        for keyword in keywords:
+                reasons.append(reason)
+        
+        # Check title keywords (boost score slightly)
+        for keyword, reason in title_entries:
             if keyword in title_lower:
-                score = CATEGORIES[category] + 10
-                if score > max_score:
-                    max_score = score
+                if score + 10 > max_score:
+                    max_score = score + 10
                     best_category = category
-                reasons.append(f"Title contains '{keyword}'")
+                reasons.append(reason)
     
     # Default score if no matches
     if max_score == 0:
@@ -10,7 +10,7 @@ import json
 import argparse
 import logging
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List
 from anthropic import Anthropic
 
@@ -40,7 +40,9 @@ def synthesize(
     
     client = Anthropic(api_key=api_key)
     
-    # Build evidence index from all extractions
+    # Build evidence index from all extractions; one timestamp for the
+    # whole index rather than a clock read per entry
+    extracted_at_iso = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
     evidence_index = {}
     for page in deep_extract.get("pages", []):
         page_evidence = page.get("evidence", {})
@@ -49,7 +51,7 @@ def synthesize(
                 "url": page.get("url"),
                 "excerpt": ev_data.get("excerpt", ""),
                 "page_title": page.get("title", ""),
-                "extracted_at_iso": datetime.utcnow().isoformat() + "Z"
+                "extracted_at_iso": extracted_at_iso
             }
     
     logger.info(f"Built evidence index with {len(evidence_index)} entries")
@@ -134,7 +136,7 @@ Return JSON in this format:
         "site": {
             "target_url": f"https://{domain}",
             "domain": domain,
-            "crawled_at_iso": datetime.utcnow().isoformat() + "Z",
+            "crawled_at_iso": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
             "robots": robots_data
         },
         "inventory": inventory,
@@ -1,10 +1,14 @@
 """
 Website uptime monitor tool.
 
-Performs HTTP GET requests to configured URLs and measures response times.
+Performs HTTP HEAD requests (falling back to GET) to configured URLs and
+measures response times.
+All URLs are checked concurrently, so a run takes about as long as the
+slowest URL rather than the sum of all of them.
 Returns structured JSON with check results for each URL.
 """
 import argparse
+import asyncio
 import json
 import logging
 import sys
@@ -12,16 +16,33 @@ import time
 from datetime import datetime, timezone
 from typing import Any
 
-import requests
+import aiohttp
 
+# Upper bound on simultaneous connections for a single run
+MAX_CONCURRENT_CHECKS = 50
 
-def check_url(url: str, timeout: int = 30) -> dict[str, Any]:
+# Seconds to cache resolved hostnames, so URLs sharing a host (or redirecting
+# to one) resolve it once per run
+DNS_CACHE_TTL = 300
+
+# HEAD responses at or above this status are re-checked with GET, since some
+# servers reject or mishandle HEAD while serving GET normally
+HEAD_FALLBACK_STATUS = 400
+
+# Seconds allowed to get a connection (pool wait, DNS lookup and connect);
+# unresolvable or unreachable hosts surface this fast instead of waiting
+# out the full --timeout
+CONNECT_TIMEOUT = 5
+
+
+async def check_url(session: aiohttp.ClientSession, url: str, timeout: int = 30) -> dict[str, Any]:
     """
     Check a single URL and return status information.
     
     Args:
+        session: Shared aiohttp session (one connection pool per run)
         url: The URL to check (must include scheme)
-        timeout: HTTP request timeout in seconds
+        timeout: HTTP request timeout in seconds (connecting is capped at CONNECT_TIMEOUT)
     
     Returns:
         dict with:
@@ -33,19 +54,33 @@ def check_url(url: str, timeout: int = 30) -> dict[str, Any]:
     """
     timestamp = datetime.now(timezone.utc).isoformat()
     
+    request_timeout = aiohttp.ClientTimeout(
+        total=timeout,
+        connect=min(CONNECT_TIMEOUT, timeout),
+    )
+    
     try:
+        # HEAD first: status and timing only need the response headers
         start = time.monotonic()
-        resp = requests.get(url, timeout=timeout, allow_redirects=True)
+        async with session.head(url, timeout=request_timeout, allow_redirects=True) as resp:
+            status = resp.status
+        
+        if status >= HEAD_FALLBACK_STATUS:
+            # Confirm with GET, stopping at the headers without reading the body
+            start = time.monotonic()
+            async with session.get(url, timeout=request_timeout, allow_redirects=True) as resp:
+                status = resp.status
+        
         elapsed = (time.monotonic() - start) * 1000  # convert to ms
         
         return {
             "timestamp": timestamp,
             "url": url,
-            "status_code": resp.status_code,
+            "status_code": status,
             "response_time_ms": round(elapsed, 2),
-            "is_up": 200 <= resp.status_code < 300,
+            "is_up": 200 <= status < 300,
         }
-    except requests.RequestException as exc:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
         logging.error(f"Failed to check {url}: {exc}")
         return {
             "timestamp": timestamp,
@@ -56,6 +91,26 @@ def check_url(url: str, timeout: int = 30) -> dict[str, Any]:
         }
 
 
+async def check_urls(urls: list[str], timeout: int = 30) -> list[dict[str, Any]]:
+    """
+    Check all URLs concurrently over one shared connection pool.
+    
+    Returns:
+        Check results in the same order as `urls`.
+    """
+    # Checks queue here rather than in the connector, so time spent waiting
+    # for a free slot doesn't count against CONNECT_TIMEOUT
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHECKS)
+    
+    async def check(session: aiohttp.ClientSession, url: str) -> dict[str, Any]:
+        async with semaphore:
+            return await check_url(session, url, timeout)
+    
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_CHECKS, ttl_dns_cache=DNS_CACHE_TTL)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(*(check(session, url) for url in urls))
+
+
 def main():
     """Main entry point for the uptime monitor tool."""
     parser = argparse.ArgumentParser(description="Monitor website uptime")
@@ -65,14 +120,13 @@ def main():
     
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
     
-    results = []
+    logging.info(f"Checking {len(args.urls)} URL(s)...")
+    results = asyncio.run(check_urls(args.urls, timeout=args.timeout))
     any_down = False
     
-    for url in args.urls:
-        logging.info(f"Checking {url}...")
-        result = check_url(url, timeout=args.timeout)
-        results.append(result)
-        
+    # Log after the gather so output order matches the --urls order
+    for result in results:
+        url = result["url"]
         if not result["is_up"]:
             any_down = True
             logging.warning(f"{url} is DOWN (status: {result['status_code']})")
@@ -80,7 +134,7 @@ def main():
             logging.info(f"{url} is UP ({result['response_time_ms']}ms)")
     
     # Output results as JSON to stdout
-    print(json.dumps(results, indent=2))
+    print(json.dumps(results, separators=(",", ":")))
     
     # Exit code: 0 if all up, 1 if any down (for GitHub Actions UI)
     sys.exit(1 if any_down else 0)
@@ -12,24 +12,34 @@ import sys
 from pathlib import Path
 from typing import Any
 
-import requests
+import httpx
 
 TELEGRAM_API = "https://api.telegram.org/bot{token}/sendMessage"
 
+# Telegram rejects messages over 4096 characters; stay under it with headroom
+MAX_MESSAGE_CHARS = 4000
+ALERT_HEADER = "⚠️ <b>WEBSITE DOWN ALERT</b>\n"
 
-def send_alert(bot_token: str, chat_id: str, message: str) -> bool:
+# Shared HTTP/2-capable client so multi-part alerts reuse one connection
+CLIENT = httpx.Client(
+    http2=True,
+    timeout=httpx.Timeout(10.0),
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+)
+
+
+def send_alert(send_url: str, chat_id: str, message: str) -> bool:
     """
     Send a Telegram message.
     
     Args:
-        bot_token: Telegram bot token from @BotFather
+        send_url: sendMessage endpoint, pre-formatted with the bot token
         chat_id: Telegram chat ID for the recipient
         message: Message text to send
     
     Returns:
         True on success, False on failure.
     """
-    url = TELEGRAM_API.format(token=bot_token)
     payload = {
         "chat_id": chat_id,
         "text": message,
@@ -37,15 +47,46 @@ def send_alert(bot_token: str, chat_id: str, message: str) -> bool:
     }
     
     try:
-        resp = requests.post(url, json=payload, timeout=10)
+        resp = CLIENT.post(send_url, json=payload)
         resp.raise_for_status()
         logging.info("Telegram alert sent successfully")
         return True
-    except requests.RequestException as exc:
+    except httpx.HTTPError as exc:
         logging.error(f"Failed to send Telegram alert: {exc}")
         return False
 
 
+def format_site(site: dict[str, Any]) -> str:
+    """Format one down site as an HTML block for the alert message."""
+    status_msg = f"status code {site['status_code']}" if site["status_code"] > 0 else "connection failed"
+    return (
+        f"\n<b>URL:</b> {site['url']}\n"
+        f"<b>Status:</b> {status_msg}\n"
+        f"<b>Timestamp:</b> {site['timestamp']}\n"
+    )
+
+
+def build_messages(down_sites: list[dict[str, Any]]) -> list[str]:
+    """
+    Combine all down sites into as few alert messages as possible.
+    
+    Sites are packed into messages under MAX_MESSAGE_CHARS; a new message
+    (with its own header) is started only when the next site would not fit.
+    """
+    messages = []
+    current = ALERT_HEADER
+    
+    for site in down_sites:
+        block = format_site(site)
+        if current != ALERT_HEADER and len(current) + len(block) > MAX_MESSAGE_CHARS:
+            messages.append(current)
+            current = ALERT_HEADER
+        current += block
+    
+    messages.append(current)
+    return messages
+
+
 def main():
     """Main entry point for the Telegram alert tool."""
     parser = argparse.ArgumentParser(description="Send Telegram alerts for down sites")
@@ -65,8 +106,9 @@ def main():
     # Parse results
     try:
         results_path = Path(args.results)
-        if results_path.exists():
-            results = json.loads(results_path.read_text())
+        if results_path.is_file():
+            # json.loads accepts bytes directly, skipping a separate decode pass
+            results = json.loads(results_path.read_bytes())
         else:
             results = json.loads(args.results)
     except Exception as exc:
@@ -80,18 +122,13 @@ def main():
         logging.info("All sites are up, no alerts needed")
         sys.exit(0)
     
-    # Send alert for each down site
-    for site in down_sites:
-        status_msg = f"status code {site['status_code']}" if site["status_code"] > 0 else "connection failed"
-        message = (
-            f"⚠️ <b>WEBSITE DOWN ALERT</b>\n\n"
-            f"<b>URL:</b> {site['url']}\n"
-            f"<b>Status:</b> {status_msg}\n"
-            f"<b>Timestamp:</b> {site['timestamp']}\n"
-        )
-        send_alert(bot_token, chat_id, message)
+    # Send every down site in one message (split only if over Telegram's limit)
+    messages = build_messages(down_sites)
+    send_url = TELEGRAM_API.format(token=bot_token)
+    for message in messages:
+        send_alert(send_url, chat_id, message)
     
-    logging.info(f"Sent {len(down_sites)} alert(s)")
+    logging.info(f"Sent {len(messages)} message(s) covering {len(down_sites)} down site(s)")
 
 
 if __name__ == "__main__":
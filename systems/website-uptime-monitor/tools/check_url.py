@@ -2,7 +2,8 @@
 """
 Uptime monitor tool: Check a URL and log the result to CSV.
 
-This tool sends an HTTP GET request to a specified URL, measures response time,
+This tool sends an HTTP HEAD request (falling back to GET) to a specified URL,
+measures response time,
 determines up/down status based on HTTP status code, and appends the result to
 a CSV log file. It is designed to run autonomously on a schedule via GitHub Actions.
 
@@ -28,7 +29,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any
 
-import requests
+import httpx
 
 
 # Configure logging
@@ -39,10 +40,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Shared HTTP/2-capable client so repeated checks reuse pooled keep-alive
+# connections (multiplexed over one connection per host where HTTP/2 is
+# offered) instead of a fresh DNS lookup and TCP+TLS handshake per request
+CLIENT = httpx.Client(
+    http2=True,
+    headers={'User-Agent': 'WAT-Uptime-Monitor/1.0'},
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+)
+
+# HEAD responses at or above this status are re-checked with GET, since some
+# servers reject or mishandle HEAD while serving GET normally
+HEAD_FALLBACK_STATUS = 400
+
 
 def check_url(url: str, timeout: int) -> Dict[str, Any]:
     """
-    Execute HTTP GET request to the target URL and measure response time.
+    Execute HTTP HEAD request (GET fallback) to the target URL and measure
+    response time.
     
     Args:
         url: The URL to check (http:// or https://)
@@ -60,17 +75,18 @@ def check_url(url: str, timeout: int) -> Dict[str, Any]:
     
     try:
         logger.info(f"Checking URL: {url}")
+        # HEAD first: status and timing only need the response headers
         start_time = time.monotonic()
+        response = CLIENT.head(url, timeout=timeout, follow_redirects=True)
+        status_code = response.status_code
         
-        response = requests.get(
-            url,
-            timeout=timeout,
-            allow_redirects=True,
-            headers={'User-Agent': 'WAT-Uptime-Monitor/1.0'}
-        )
+        if status_code >= HEAD_FALLBACK_STATUS:
+            # Confirm with GET, closing the stream without reading the body
+            start_time = time.monotonic()
+            with CLIENT.stream('GET', url, timeout=timeout, follow_redirects=True) as response:
+                status_code = response.status_code
         
         elapsed_ms = (time.monotonic() - start_time) * 1000
-        status_code = response.status_code
         
         # Status codes < 400 are considered "up"
         is_up = status_code < 400
@@ -84,7 +100,7 @@ def check_url(url: str, timeout: int) -> Dict[str, Any]:
             'is_up': is_up,
         }
         
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         # Timeout counts as down with response_time = timeout period
         elapsed_ms = timeout * 1000
         logger.warning(f"Request timed out after {timeout}s")
@@ -96,7 +112,7 @@ def check_url(url: str, timeout: int) -> Dict[str, Any]:
             'error': 'Timeout',
         }
         
-    except requests.exceptions.ConnectionError as exc:
+    except httpx.NetworkError as exc:
         # Connection errors (DNS failure, connection refused, etc.)
         logger.error(f"Connection error: {exc}")
         return {
@@ -107,7 +123,7 @@ def check_url(url: str, timeout: int) -> Dict[str, Any]:
             'error': f'ConnectionError: {str(exc)[:100]}',
         }
         
-    except requests.exceptions.RequestException as exc:
+    except (httpx.HTTPError, httpx.InvalidURL) as exc:
         # Catch-all for any other request errors
         logger.error(f"Request error: {exc}")
         return {
@@ -119,51 +135,79 @@ def check_url(url: str, timeout: int) -> Dict[str, Any]:
         }
 
 
-def append_to_csv(csv_path: Path, url: str, check_result: Dict[str, Any]) -> None:
+CSV_HEADERS = ['timestamp', 'url', 'status_code', 'response_time_ms', 'is_up']
+
+
+class CsvLogger:
     """
-    Append the check result to the CSV log file.
+    Append check results to the CSV log file through one open handle.
     
-    Creates the file with headers if it doesn't exist.
-    Opens in append mode to add new records.
+    The file is opened once on entry (creating it with headers if it doesn't
+    exist) and every append reuses the same csv.writer, so logging several
+    results costs one open/close rather than one per row. The handle is line
+    buffered, so each row reaches the file as soon as it is written.
+    
+    Usage:
+        with CsvLogger(csv_path) as log:
+            log.append(url, check_result)
     
-    Args:
-        csv_path: Path to the CSV log file
-        url: The URL that was checked
-        check_result: Dictionary returned from check_url()
-        
     Raises:
         OSError: If directory creation or file write fails
     """
-    # Ensure the logs directory exists
-    csv_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Check if file exists to determine if we need to write headers
-    file_exists = csv_path.exists()
+    def __init__(self, csv_path: Path):
+        self.csv_path = csv_path
+        self._file = None
+        self._writer = None
     
-    try:
-        # Open in append mode with newline='' to prevent blank rows on Windows
-        with csv_path.open('a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
+    def __enter__(self) -> 'CsvLogger':
+        # Ensure the logs directory exists
+        self.csv_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Check if file exists to determine if we need to write headers
+        file_exists = self.csv_path.exists()
+        
+        try:
+            # Append mode with newline='' to prevent blank rows on Windows
+            self._file = self.csv_path.open('a', newline='', encoding='utf-8', buffering=1)
+            self._writer = csv.writer(self._file)
             
             # Write headers only if this is a new file
             if not file_exists:
-                writer.writerow(['timestamp', 'url', 'status_code', 'response_time_ms', 'is_up'])
-                logger.info(f"Created new CSV log file: {csv_path}")
-            
-            # Write the data row
-            writer.writerow([
+                self._writer.writerow(CSV_HEADERS)
+                logger.info(f"Created new CSV log file: {self.csv_path}")
+        except OSError as exc:
+            logger.error(f"Failed to open CSV file: {exc}")
+            raise
+        
+        return self
+    
+    def append(self, url: str, check_result: Dict[str, Any]) -> None:
+        """
+        Write one check result as a CSV row.
+        
+        Args:
+            url: The URL that was checked
+            check_result: Dictionary returned from check_url()
+        """
+        try:
+            self._writer.writerow([
                 check_result['timestamp'],
                 url,
                 check_result['status_code'],
                 check_result['response_time_ms'],
                 check_result['is_up'],
             ])
-            
-        logger.info(f"Appended result to {csv_path}")
+        except OSError as exc:
+            logger.error(f"Failed to write to CSV file: {exc}")
+            raise
         
-    except OSError as exc:
-        logger.error(f"Failed to write to CSV file: {exc}")
-        raise
+        logger.info(f"Appended result to {self.csv_path}")
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
 
 
 def main() -> int:
@@ -238,7 +282,8 @@ Exit codes:
     # Append result to CSV
     try:
         csv_path = Path(args.csv)
-        append_to_csv(csv_path, args.url, check_result)
+        with CsvLogger(csv_path) as log:
+            log.append(args.url, check_result)
     except Exception as exc:
         logger.error(f"Failed to log result to CSV: {exc}")
         return 1
@@ -256,7 +301,7 @@ Exit codes:
     if 'error' in check_result:
         output['error'] = check_result['error']
     
-    print(json.dumps(output, indent=2))
+    print(json.dumps(output, separators=(',', ':')))
     
     # Exit code: 0 if up, 1 if down
     # This allows GitHub Actions to show workflow as "failed" when site is down
@@ -264,4 +309,7 @@ Exit codes:
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    try:
+        sys.exit(main())
+    finally:
+        CLIENT.close()
@@ -24,9 +24,9 @@ from datetime import datetime, timezone
 from typing import Tuple
 
 try:
-    import requests
+    import httpx
 except ImportError:
-    print("ERROR: requests library not installed. Run: pip install requests", file=sys.stderr)
+    print("ERROR: httpx library not installed. Run: pip install 'httpx[http2]'", file=sys.stderr)
     sys.exit(1)
 
 # Configure logging
@@ -36,10 +36,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Shared HTTP/2-capable client so repeated checks reuse pooled keep-alive
+# connections (multiplexed over one connection per host where HTTP/2 is
+# offered) instead of a fresh DNS lookup and TCP+TLS handshake per request
+CLIENT = httpx.Client(
+    http2=True,
+    headers={'User-Agent': 'WAT-Uptime-Monitor/1.0'},
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+)
+
+# HEAD responses at or above this status are re-checked with GET, since some
+# servers reject or mishandle HEAD while serving GET normally
+HEAD_FALLBACK_STATUS = 400
+
 
 def check_url(url: str, timeout: int) -> Tuple[int, int, bool]:
     """
-    Make HTTP GET request to URL and measure response time.
+    Make HTTP HEAD request (GET fallback) to URL and measure response time.
     
     Args:
         url: Target URL to check (must include protocol)
@@ -52,29 +65,32 @@ def check_url(url: str, timeout: int) -> Tuple[int, int, bool]:
         - is_up: True if 200-399 status, False otherwise
     """
     try:
+        # HEAD first: status and timing only need the response headers
         start = time.perf_counter()
-        response = requests.get(
-            url,
-            timeout=timeout,
-            allow_redirects=True,
-            headers={'User-Agent': 'WAT-Uptime-Monitor/1.0'}
-        )
-        elapsed_ms = int((time.perf_counter() - start) * 1000)
+        response = CLIENT.head(url, timeout=timeout, follow_redirects=True)
         status_code = response.status_code
+        
+        if status_code >= HEAD_FALLBACK_STATUS:
+            # Confirm with GET, closing the stream without reading the body
+            start = time.perf_counter()
+            with CLIENT.stream('GET', url, timeout=timeout, follow_redirects=True) as response:
+                status_code = response.status_code
+        
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
         is_up = 200 <= status_code < 400
         
         logger.info(f"Check completed: {status_code} in {elapsed_ms}ms")
         return status_code, elapsed_ms, is_up
         
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.warning(f"Request timed out after {timeout}s")
         return 0, timeout * 1000, False
         
-    except requests.exceptions.ConnectionError as e:
+    except httpx.NetworkError as e:
         logger.error(f"Connection failed: {e}")
         return 0, timeout * 1000, False
         
-    except requests.exceptions.RequestException as e:
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
         logger.error(f"Request failed: {e}")
         return 0, timeout * 1000, False
 
@@ -181,4 +197,7 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    try:
+        sys.exit(main())
+    finally:
+        CLIENT.close()
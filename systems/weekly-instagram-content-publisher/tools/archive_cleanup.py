@@ -6,12 +6,19 @@ Prune old content pack archives (keep last 12 weeks).
 import argparse
 import json
 import logging
+import os
+import re
+import shutil
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
+# Archive directories are named YYYY-MM-DD; zero-padded, so names sort
+# chronologically and can be compared as plain strings
+DATE_DIR_RE = re.compile(r"\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])")
+
 
 def main():
     parser = argparse.ArgumentParser(description="Clean up old archives")
@@ -26,24 +33,34 @@ def main():
             logging.info("Archive directory does not exist, nothing to clean")
             return 0
         
-        cutoff = datetime.utcnow() - timedelta(weeks=args.retention_weeks)
+        cutoff = datetime.now(timezone.utc) - timedelta(weeks=args.retention_weeks)
+        cutoff_str = cutoff.strftime("%Y-%m-%d")
         deleted = []
         
-        for item in archive_dir.iterdir():
-            if not item.is_dir():
-                continue
-            
-            # Check if directory name is a date (YYYY-MM-DD)
-            try:
-                dir_date = datetime.strptime(item.name, "%Y-%m-%d")
-                if dir_date < cutoff:
+        # scandir entries carry the file type from readdir, so is_dir()
+        # needs no extra stat call per entry
+        with os.scandir(archive_dir) as entries:
+            for item in entries:
+                if not item.is_dir(follow_symlinks=False):
+                    continue
+                
+                # Skip anything that isn't a date directory (YYYY-MM-DD).
+                # The regex is a cheap first filter; strptime then rejects
+                # impossible dates such as 2023-02-30 before anything is
+                # deleted
+                if not DATE_DIR_RE.fullmatch(item.name):
+                    continue
+                try:
+                    datetime.strptime(item.name, "%Y-%m-%d")
+                except ValueError:
+                    continue
+                
+                # A directory dated on the cutoff day is older than the
+                # cutoff instant (midnight vs. time of day), so it goes too
+                if item.name <= cutoff_str:
                     logging.info(f"Deleting old archive: {item.name}")
-                    import shutil
-                    shutil.rmtree(item)
+                    shutil.rmtree(item.path)
                     deleted.append(item.name)
-            except ValueError:
-                # Not a date directory, skip
-                continue
         
         logging.info(f"Cleanup complete: {len(deleted)} directories deleted")
         print(json.dumps({"deleted": deleted, "count": len(deleted)}, indent=2))
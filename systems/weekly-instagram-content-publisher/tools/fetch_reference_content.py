@@ -3,34 +3,64 @@
 Fetch and extract content from reference URLs using Firecrawl with HTTP fallback.
 
 Uses Firecrawl API (primary) or HTTP GET + BeautifulSoup (fallback) to extract
-clean text content from reference URLs.
+clean text content from reference URLs. All URLs are fetched concurrently.
 """
 
 import argparse
+import asyncio
 import json
 import logging
 import os
 import sys
-from typing import Any, Dict, List
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from bs4 import BeautifulSoup, FeatureNotFound
+
+try:
+    from firecrawl import FirecrawlApp
+except ImportError:
+    FirecrawlApp = None  # HTTP fallback only
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
+# Characters of page content kept per reference. Downstream prompts use at
+# most the first 1000, so storing whole pages only inflates the JSON
+MAX_CONTENT_CHARS = 2000
+
 
-def fetch_with_firecrawl(url: str) -> Dict[str, Any]:
+def create_firecrawl_app() -> Optional[Any]:
+    """
+    Build one Firecrawl client for the whole run.
+    
+    Returns None when FIRECRAWL_API_KEY is unset or the SDK can't be loaded,
+    so callers skip straight to the HTTP fallback instead of failing per URL.
+    """
+    api_key = os.environ.get("FIRECRAWL_API_KEY")
+    if not api_key:
+        logging.info("FIRECRAWL_API_KEY not set, using HTTP fallback only")
+        return None
+    
+    if FirecrawlApp is None:
+        logging.warning("firecrawl-py not installed, using HTTP fallback only")
+        return None
+    
+    try:
+        return FirecrawlApp(api_key=api_key)
+    except Exception as e:
+        logging.warning(f"Firecrawl unavailable, using HTTP fallback only: {e}")
+        return None
+
+
+def fetch_with_firecrawl(app, url: str) -> Dict[str, Any]:
     """Fetch content using Firecrawl API."""
     try:
-        from firecrawl import FirecrawlApp
-        
-        api_key = os.environ.get("FIRECRAWL_API_KEY")
-        if not api_key:
-            raise ValueError("FIRECRAWL_API_KEY not set")
-        
-        app = FirecrawlApp(api_key=api_key)
         result = app.scrape_url(url, params={"formats": ["markdown"]})
         
         return {
             "url": url,
-            "content": result.get("markdown", ""),
+            "content": result.get("markdown", "")[:MAX_CONTENT_CHARS],
             "metadata": result.get("metadata", {}),
             "success": True,
             "method": "firecrawl"
@@ -40,40 +70,87 @@ def fetch_with_firecrawl(url: str) -> Dict[str, Any]:
         raise
 
 
-def fetch_with_http(url: str) -> Dict[str, Any]:
+def parse_html(url: str, html: str) -> Dict[str, Any]:
+    """Extract title and paragraph text from an HTML page."""
+    # lxml's C parser is several times faster than the pure-Python one;
+    # fall back to html.parser where lxml isn't installed
+    try:
+        soup = BeautifulSoup(html, "lxml")
+    except FeatureNotFound:
+        soup = BeautifulSoup(html, "html.parser")
+    
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+    
+    # Extract main content (heuristic: get all <p> tags)
+    paragraphs = soup.find_all("p")
+    content = "\n\n".join(text for p in paragraphs if (text := p.get_text().strip()))
+    
+    # Get title
+    title = soup.title.string if soup.title else ""
+    
+    return {
+        "url": url,
+        "content": content[:MAX_CONTENT_CHARS],
+        "metadata": {"title": title},
+        "success": True,
+        "method": "http_fallback"
+    }
+
+
+async def fetch_with_http(client, url: str) -> Dict[str, Any]:
     """Fetch content using HTTP GET + BeautifulSoup."""
     try:
-        import httpx
-        from bs4 import BeautifulSoup
-        
-        resp = httpx.get(url, timeout=15, follow_redirects=True)
+        resp = await client.get(url, timeout=15, follow_redirects=True)
         resp.raise_for_status()
         
-        soup = BeautifulSoup(resp.text, "html.parser")
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Extract main content (heuristic: get all <p> tags)
-        paragraphs = soup.find_all("p")
-        content = "\n\n".join(p.get_text().strip() for p in paragraphs if p.get_text().strip())
-        
-        # Get title
-        title = soup.title.string if soup.title else ""
-        
-        return {
-            "url": url,
-            "content": content,
-            "metadata": {"title": title},
-            "success": True,
-            "method": "http_fallback"
-        }
+        # Parse off the event loop so a large page doesn't stall other fetches
+        return await asyncio.to_thread(parse_html, url, resp.text)
     except Exception as e:
         logging.error(f"HTTP fallback failed for {url}: {e}")
         raise
 
 
+async def fetch_one(client, firecrawl_app, url: str) -> Dict[str, Any]:
+    """Fetch one URL via Firecrawl, falling back to HTTP, never raising."""
+    logging.info(f"Fetching: {url}")
+    
+    # Try Firecrawl first when configured (sync SDK, so run it in a worker thread)
+    if firecrawl_app is not None:
+        try:
+            result = await asyncio.to_thread(fetch_with_firecrawl, firecrawl_app, url)
+            logging.info(f"✓ Fetched via Firecrawl: {url}")
+            return result
+        except Exception:
+            pass  # Fall through to HTTP fallback
+    
+    # Try HTTP fallback
+    try:
+        result = await fetch_with_http(client, url)
+        logging.info(f"✓ Fetched via HTTP: {url}")
+        return result
+    except Exception as e:
+        # Both methods failed
+        logging.error(f"✗ Failed to fetch: {url}")
+        return {
+            "url": url,
+            "content": "",
+            "metadata": {},
+            "success": False,
+            "error": str(e),
+            "method": "none"
+        }
+
+
+async def fetch_all(urls: List[str]) -> List[Dict[str, Any]]:
+    """Fetch all URLs concurrently over one pooled client, preserving order."""
+    firecrawl_app = create_firecrawl_app()
+    limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+    async with httpx.AsyncClient(limits=limits) as client:
+        return await asyncio.gather(*(fetch_one(client, firecrawl_app, url) for url in urls))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Fetch reference content from URLs"
@@ -88,6 +165,11 @@ def main():
         default="reference_content.json",
         help="Output file path"
     )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Don't echo the output JSON to stdout (the file is always written)"
+    )
     
     args = parser.parse_args()
     
@@ -97,41 +179,13 @@ def main():
         if not isinstance(links, list):
             raise ValueError("reference_links must be a JSON array")
         
-        results = []
-        
+        urls = []
         for link in links:
             url = link.get("url") if isinstance(link, dict) else link
-            if not url:
-                continue
-            
-            logging.info(f"Fetching: {url}")
-            
-            # Try Firecrawl first
-            try:
-                result = fetch_with_firecrawl(url)
-                results.append(result)
-                logging.info(f"✓ Fetched via Firecrawl: {url}")
-                continue
-            except Exception:
-                pass  # Fall through to HTTP fallback
-            
-            # Try HTTP fallback
-            try:
-                result = fetch_with_http(url)
-                results.append(result)
-                logging.info(f"✓ Fetched via HTTP: {url}")
-                continue
-            except Exception as e:
-                # Both methods failed
-                results.append({
-                    "url": url,
-                    "content": "",
-                    "metadata": {},
-                    "success": False,
-                    "error": str(e),
-                    "method": "none"
-                })
-                logging.error(f"✗ Failed to fetch: {url}")
+            if url:
+                urls.append(url)
+        
+        results = asyncio.run(fetch_all(urls))
         
         # Compile output
         output = {
@@ -142,14 +196,17 @@ def main():
         }
         
         # Write output
-        output_path = Path(args.output) if 'Path' in dir() else args.output
-        with open(output_path, 'w') as f:
-            json.dump(output, f, indent=2)
+        output_path = Path(args.output)
+        # Serialize once (compact, since the next step reads it) and reuse
+        # the same text for the file and stdout; scraped pages can be large
+        data = json.dumps(output, separators=(",", ":"))
+        output_path.write_bytes(data.encode("utf-8"))
         
         logging.info(
             f"Reference content fetched: {output['successful']}/{output['total_urls']} successful"
         )
-        print(json.dumps(output, indent=2))
+        if not args.quiet:
+            print(data)
         
         return 0
         
@@ -162,5 +219,4 @@ def main():
 
 
 if __name__ == "__main__":
-    from pathlib import Path
     sys.exit(main())
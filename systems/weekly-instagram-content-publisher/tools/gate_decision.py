@@ -11,6 +11,7 @@ import argparse
 import json
 import logging
 import sys
+from pathlib import Path
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
@@ -38,10 +39,14 @@ def main():
     
     args = parser.parse_args()
     
+    review_path = Path(args.review_report)
+    if not review_path.is_file():
+        logging.error(f"Input file not found: {review_path}")
+        return 1
+    
     try:
-        # Load review report
-        with open(args.review_report) as f:
-            review = json.load(f)
+        # Load review report (json.loads accepts the raw bytes directly)
+        review = json.loads(review_path.read_bytes())
         
         pass_fail = review.get("pass_fail", "FAIL")
         overall_score = review.get("overall_score", 0)
@@ -70,12 +75,9 @@ def main():
             json.dump(decision, f, indent=2)
         
         logging.info(f"Decision: {action} - {rationale}")
-        print(json.dumps(decision, indent=2))
+        print(json.dumps(decision, separators=(",", ":")))
         return 0
         
-    except FileNotFoundError as e:
-        logging.error(f"Input file not found: {e}")
-        return 1
     except Exception as e:
         logging.error(f"Unexpected error: {e}")
         return 1
@@ -7,55 +7,80 @@ import argparse
 import json
 import logging
 import sys
-from datetime import datetime
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
+# Write buffer for the pack files (default is 8 KiB)
+WRITE_BUFFER_SIZE = 1 << 17
 
-def generate_markdown(content: dict, review: dict, theme: str) -> str:
-    """Generate Markdown content pack."""
-    md = f"""# Instagram Content Pack
-    
-**Generated:** {datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")}
-**Weekly Theme:** {theme}
-**Total Posts:** {len(content.get('posts', []))}
-**Quality Score:** {review.get('overall_score', 0)}/100 - {review.get('pass_fail', 'UNKNOWN')}
-
----
-
-"""
-    
-    for post in content.get("posts", []):
-        if post.get("status") == "failed":
-            md += f"## Post {post['post_id']} - FAILED\n\nError: {post.get('error', 'Unknown')}\n\n---\n\n"
-            continue
-        
-        md += f"""## Post {post['post_id']}: {post.get('type', 'unknown').upper()}
+# Markdown section for one post, filled with str.format_map so the template
+# is parsed once rather than per post; missing fields render empty
+POST_TEMPLATE = """## Post {post_id}: {type_upper}
 
-**Hook:** {post.get('hook', '')}
+**Hook:** {hook}
 
 **Caption:**
-{post.get('caption', '')}
+{caption}
 
-**CTA:** {post.get('cta', '')}
+**CTA:** {cta}
 
 **Hashtags:**
-{' '.join(post.get('hashtags', []))}
+{hashtags_joined}
 
-**Alt Text:** {post.get('alt_text', '')}
+**Alt Text:** {alt_text}
 
 **Creative Brief:**
-{post.get('creative_brief', '')}
+{creative_brief}
 
 **Image Prompt:**
-{post.get('image_prompt', '')}
+{image_prompt}
 
 ---
 
 """
+
+
+def generate_markdown(content: dict, review: dict, theme: str, now: datetime) -> list:
+    """Generate Markdown content pack as a list of sections, in order."""
+    posts = content.get("posts", [])
+    parts = [f"""# Instagram Content Pack
+    
+**Generated:** {now.strftime("%Y-%m-%d %H:%M UTC")}
+**Weekly Theme:** {theme}
+**Total Posts:** {len(posts)}
+**Quality Score:** {review.get('overall_score', 0)}/100 - {review.get('pass_fail', 'UNKNOWN')}
+
+---
+
+"""]
+    
+    for post in posts:
+        if post.get("status") == "failed":
+            parts.append(f"## Post {post['post_id']} - FAILED\n\nError: {post.get('error', 'Unknown')}\n\n---\n\n")
+            continue
+        
+        fields = defaultdict(str, post)
+        fields["type_upper"] = post.get("type", "unknown").upper()
+        fields["hashtags_joined"] = " ".join(post.get("hashtags") or ())
+        parts.append(POST_TEMPLATE.format_map(fields))
     
-    return md
+    return parts
+
+
+def write_markdown(path: Path, parts: list) -> None:
+    """Write the Markdown sections to path."""
+    with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.writelines(parts)
+
+
+def write_json(path: Path, data: dict) -> None:
+    """Write data to path as indented JSON."""
+    with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        json.dump(data, f, indent=2)
 
 
 def main():
@@ -77,28 +102,37 @@ def main():
         output_dir = Path(args.output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        date_str = datetime.utcnow().strftime("%Y-%m-%d")
+        # One clock read for the whole pack, so the file names, Markdown and
+        # JSON timestamps always agree (even when run across midnight UTC)
+        now = datetime.now(timezone.utc)
+        date_str = now.strftime("%Y-%m-%d")
         
         # Generate Markdown
-        md = generate_markdown(content, review, args.weekly_theme)
+        md_parts = generate_markdown(content, review, args.weekly_theme, now)
         md_path = output_dir / f"content_pack_{date_str}.md"
-        md_path.write_text(md)
         
-        # Write JSON
+        # Build JSON
         json_path = output_dir / f"content_pack_{date_str}.json"
         json_data = {
             "metadata": {
-                "generated_at": datetime.utcnow().isoformat() + "Z",
+                "generated_at": now.isoformat().replace("+00:00", "Z"),
                 "theme": args.weekly_theme,
                 "total_posts": len(content.get("posts", [])),
                 "quality_score": review.get("overall_score", 0)
             },
             "posts": content.get("posts", [])
         }
-        json_path.write_text(json.dumps(json_data, indent=2))
+        
+        # The two files are independent, so write them concurrently; the GIL
+        # is released during the write syscalls, which matters on slow disks
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            md_write = executor.submit(write_markdown, md_path, md_parts)
+            json_write = executor.submit(write_json, json_path, json_data)
+            md_write.result()
+            json_write.result()
         
         logging.info(f"Content pack generated: {md_path}")
-        print(json.dumps({"md": str(md_path), "json": str(json_path)}, indent=2))
+        print(json.dumps({"md": str(md_path), "json": str(json_path)}, separators=(",", ":")))
         return 0
         
     except Exception as e:
@@ -6,46 +6,162 @@ Produces per-post content briefs, posting schedule, and content themes.
 """
 
 import argparse
+import hashlib
+import itertools
 import json
 import logging
 import os
+import re
 import sys
-from typing import Any, Dict
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import anthropic
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
+# Markdown code fence around an LLM reply, with optional language tag
+FENCE_RE = re.compile(r"```[\w-]*[ \t]*\n(.*?)\n?```", re.DOTALL)
+
+MODEL = "claude-sonnet-4-20250514"
+BASE_TEMPERATURE = 0.3
+
+# Reference sources included in the prompt; more dilutes it and adds cost
+MAX_REFERENCES = 10
+
+# Strategies are cached here keyed on a hash of every input, so reruns with
+# byte-identical inputs skip the LLM call
+CACHE_DIR = Path.home() / ".cache" / "ig_content_publisher" / "strategy"
+
+# Part of the cache key: bump it whenever the prompt built in
+# generate_strategy_with_llm changes, so earlier cached strategies are ignored
+PROMPT_VERSION = 1
+
+# Added to the prompt (with a slightly higher temperature) after the model
+# returned something that wasn't the expected JSON
+STRICT_JSON_NOTE = "\n\nIMPORTANT: Return raw JSON only, no prose, no markdown fences."
+
+# Upper bound on the backoff between retries of transient API errors (seconds)
+MAX_RETRY_DELAY = 30
+
+
+_client = None
+
+
+def get_client() -> anthropic.Anthropic:
+    """Return the shared Anthropic client, so retries reuse its connection pool."""
+    global _client
+    if _client is None:
+        _client = anthropic.Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+    return _client
+
+
+def is_transient(exc: Exception) -> bool:
+    """True for API errors worth retrying unchanged: network, 429 and 5xx."""
+    if isinstance(exc, anthropic.APIConnectionError):
+        return True
+    if isinstance(exc, anthropic.APIStatusError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return False
+
+
+def retry_delay(exc: Exception, attempt: int) -> float:
+    """Seconds to wait before retrying: Retry-After if given, else exponential."""
+    retry_after = None
+    if isinstance(exc, anthropic.RateLimitError):
+        retry_after = exc.response.headers.get("retry-after")
+    try:
+        delay = float(retry_after) if retry_after else 2 ** attempt
+    except ValueError:
+        delay = 2 ** attempt
+    return min(delay, MAX_RETRY_DELAY)
+
+
+def strategy_cache_path(inputs: Dict[str, Any], references: Dict[str, Any]) -> Path:
+    """Cache file for these exact inputs, model and prompt."""
+    key_data = json.dumps({
+        "model": MODEL,
+        "prompt_version": PROMPT_VERSION,
+        "temperature": BASE_TEMPERATURE,
+        "max_refs": MAX_REFERENCES,
+        "bp": inputs["brand_profile"],
+        "theme": inputs["weekly_theme"],
+        "plan": inputs["post_plan"],
+        "refs": [r for r in references.get("reference_content", []) if r.get("success")],
+    }, sort_keys=True, separators=(",", ":"))
+    key = hashlib.blake2b(key_data.encode("utf-8"), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+def load_cached_strategy(cache_path: Path) -> Optional[Dict[str, Any]]:
+    """Return the cached strategy, or None on a miss or unreadable entry."""
+    try:
+        return json.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_strategy(cache_path: Path, strategy: Dict[str, Any]) -> None:
+    """Store a strategy in the cache; failures only cost the next run a call."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(json.dumps(strategy, separators=(",", ":")).encode("utf-8"))
+    except OSError as e:
+        logging.warning(f"Could not write strategy cache: {e}")
+
+
+def write_strategy(output: str, strategy: Dict[str, Any], print_full: bool = False) -> None:
+    """Write the strategy to the output file and echo it (or a summary) on stdout."""
+    with open(output, 'w') as f:
+        json.dump(strategy, f, indent=2)
+    
+    logging.info(f"Strategy generated: {len(strategy['post_briefs'])} post briefs")
+    if print_full:
+        print(json.dumps(strategy, separators=(",", ":")))
+    else:
+        print(json.dumps({"output": output, "post_briefs": len(strategy["post_briefs"])}))
+
 
 def generate_strategy_with_llm(
     brand_profile: Dict[str, Any],
     weekly_theme: str,
     post_plan: Dict[str, Any],
-    reference_content: Dict[str, Any]
+    reference_content: Dict[str, Any],
+    temperature: float = BASE_TEMPERATURE,
+    strict_json: bool = False
 ) -> Dict[str, Any]:
     """Generate content strategy using Claude."""
     try:
-        import anthropic
-        
-        client = anthropic.Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+        client = get_client()
         
         # Build context
-        ref_text = "\n\n".join(
-            f"Source: {r['url']}\n{r['content'][:1000]}"
-            for r in reference_content.get("reference_content", [])
-            if r.get("success")
-        ) or "No reference material provided."
+        ref_text = "\n\n".join(itertools.islice(
+            (
+                f"Source: {r['url']}\n{r['content'][:1000]}"
+                for r in reference_content.get("reference_content", [])
+                if r.get("success")
+            ),
+            MAX_REFERENCES
+        )) or "No reference material provided."
         
         total_posts = sum(
             post_plan.get(t, 0) for t in ["reels", "carousels", "single_images", "stories"]
         )
         
-        prompt = f"""You are a social media strategist creating an Instagram content strategy.
+        # Brand profile and reference material are the bulk of the prompt and
+        # don't change between retries, so they form a cacheable prefix
+        context = f"""You are a social media strategist creating an Instagram content strategy.
 
 **Brand:** {brand_profile['brand_name']}
 **Tone:** {brand_profile['tone']}
 **Target Audience:** {brand_profile['target_audience']}
 **Products/Services:** {', '.join(brand_profile['products'])}
 
-**Weekly Theme:** {weekly_theme}
+**Reference Material:**
+{ref_text}"""
+        
+        prompt = f"""**Weekly Theme:** {weekly_theme}
 
 **Post Plan:**
 - Reels: {post_plan.get('reels', 0)}
@@ -54,9 +170,6 @@ def generate_strategy_with_llm(
 - Stories: {post_plan.get('stories', 0)}
 Total: {total_posts} posts
 
-**Reference Material:**
-{ref_text}
-
 **Task:** Generate a complete content strategy with:
 1. A content brief for EACH post (one brief per reel, carousel, single image)
 2. A posting schedule (spread posts across 7 days, optimal times)
@@ -87,19 +200,28 @@ Return ONLY valid JSON matching this schema:
 }}
 
 Generate {total_posts} post briefs, one for each post in the plan."""
+        if strict_json:
+            prompt += STRICT_JSON_NOTE
         
         response = client.messages.create(
-            model="claude-sonnet-4-20250514",
+            model=MODEL,
             max_tokens=4096,
-            temperature=0.3,
-            messages=[{"role": "user", "content": prompt}]
+            temperature=temperature,
+            messages=[{
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": context, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": prompt},
+                ]
+            }]
         )
         
         text = response.content[0].text.strip()
         
         # Strip markdown fences if present
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1].rsplit("```", 1)[0].strip()
+        fenced = FENCE_RE.fullmatch(text)
+        if fenced:
+            text = fenced[1].strip()
         
         strategy = json.loads(text)
         
@@ -147,6 +269,17 @@ def main():
         default=2,
         help="Number of retries on failure"
     )
+    parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=not os.environ.get("CI"),
+        help="Reuse strategies for identical inputs (default: on, off when CI is set)"
+    )
+    parser.add_argument(
+        "--print-full",
+        action="store_true",
+        help="Echo the full output JSON to stdout instead of a summary"
+    )
     
     args = parser.parse_args()
     
@@ -158,7 +291,19 @@ def main():
         with open(args.reference_content) as f:
             references = json.load(f)
         
-        # Generate strategy with retry
+        cache_path = strategy_cache_path(inputs, references) if args.cache else None
+        if cache_path is not None:
+            strategy = load_cached_strategy(cache_path)
+            if strategy is not None:
+                logging.info(f"Using cached strategy: {cache_path}")
+                write_strategy(args.output, strategy, args.print_full)
+                return 0
+        
+        # Generate strategy with retry. Transient API errors are retried
+        # unchanged after a backoff; malformed output is retried at once with
+        # a stricter prompt; anything else fails immediately.
+        temperature = BASE_TEMPERATURE
+        strict_json = False
         for attempt in range(1, args.retries + 2):
             try:
                 logging.info(f"Generating strategy (attempt {attempt}/{args.retries + 1})")
@@ -167,23 +312,34 @@ def main():
                     inputs["brand_profile"],
                     inputs["weekly_theme"],
                     inputs["post_plan"],
-                    references
+                    references,
+                    temperature=temperature,
+                    strict_json=strict_json
                 )
                 
-                # Write output
-                with open(args.output, 'w') as f:
-                    json.dump(strategy, f, indent=2)
-                
-                logging.info(f"Strategy generated: {len(strategy['post_briefs'])} post briefs")
-                print(json.dumps(strategy, indent=2))
+                if cache_path is not None:
+                    save_cached_strategy(cache_path, strategy)
+                write_strategy(args.output, strategy, args.print_full)
                 return 0
                 
+            except ValueError as e:
+                # Invalid JSON (JSONDecodeError) or a malformed strategy
+                if attempt > args.retries:
+                    logging.error(f"Strategy generation failed after {attempt} attempts")
+                    return 1
+                temperature = min(temperature + 0.1, 1.0)
+                strict_json = True
+                logging.warning(f"Attempt {attempt} returned invalid output: {e}. Retrying with stricter prompt...")
             except Exception as e:
+                if not is_transient(e):
+                    logging.error(f"Strategy generation failed: {e}")
+                    return 1
                 if attempt > args.retries:
                     logging.error(f"Strategy generation failed after {attempt} attempts")
                     return 1
-                logging.warning(f"Attempt {attempt} failed: {e}. Retrying...")
-                continue
+                delay = retry_delay(e, attempt)
+                logging.warning(f"Attempt {attempt} failed: {e}. Retrying in {delay:.0f}s...")
+                time.sleep(delay)
         
     except FileNotFoundError as e:
         logging.error(f"Input file not found: {e}")
@@ -2,7 +2,9 @@
 """
 Generate complete Instagram post content for all posts.
 
-Supports both parallel generation (Agent Teams) and sequential execution.
+Small plans are generated in one LLM call that returns every post; larger
+ones (or --per-post) use one call per post, run concurrently in a thread
+pool (the calls are network-bound), or sequentially with --max-concurrency 1.
 Each post includes: hook, caption, CTA, hashtags, alt_text, creative_brief, image_prompt.
 """
 
@@ -10,28 +12,70 @@ import argparse
 import json
 import logging
 import os
+import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List
 
+import anthropic
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
+# Markdown code fence around an LLM reply, with optional language tag
+FENCE_RE = re.compile(r"```[\w-]*[ \t]*\n(.*?)\n?```", re.DOTALL)
 
-def generate_single_post_with_llm(
-    post_brief: Dict[str, Any],
-    brand_profile: Dict[str, Any],
-    post_number: int
-) -> Dict[str, Any]:
-    """Generate content for a single post using Claude."""
-    try:
-        import anthropic
-        
-        client = anthropic.Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
-        
-        # Extract hashtag preferences
-        hashtag_count = brand_profile.get("hashtag_preferences", {}).get("count", "8-12")
-        hashtag_avoid = brand_profile.get("hashtag_preferences", {}).get("avoid", [])
-        
-        prompt = f"""You are an Instagram content creator. Generate complete content for ONE Instagram post.
+MODEL = "claude-sonnet-4-20250514"
+
+# Default cap on simultaneous LLM calls; kept low to stay under API rate limits
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Up to this many posts are generated in one call returning a JSON array;
+# larger plans (or --per-post) use one call per post
+MAX_BATCH_POSTS = 8
+MAX_BATCH_TOKENS = 8192
+
+# Fields every generated post must have, with their expected JSON types
+POST_FIELDS = {
+    "hook": str,
+    "caption": str,
+    "cta": str,
+    "hashtags": list,
+    "alt_text": str,
+    "creative_brief": str,
+    "image_prompt": str,
+}
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Return the shared Anthropic client, creating it on first use.
+    
+    One client per run lets every worker thread reuse its pooled
+    connections instead of opening new ones per post.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = anthropic.Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+        return _client
+
+
+def build_brand_preamble(brand_profile: Dict[str, Any]) -> str:
+    """
+    Brand context and content requirements shared by every post.
+    
+    Identical across all calls in a run (batched or per-post), so it is
+    sent first and marked cacheable.
+    """
+    # Extract hashtag preferences
+    hashtag_count = brand_profile.get("hashtag_preferences", {}).get("count", "8-12")
+    hashtag_avoid = brand_profile.get("hashtag_preferences", {}).get("avoid", [])
+    
+    return f"""You are an Instagram content creator.
 
 **Brand:** {brand_profile['brand_name']}
 **Tone:** {brand_profile['tone']}
@@ -39,18 +83,21 @@ def generate_single_post_with_llm(
 **Emoji Style:** {brand_profile.get('emoji_style', 'minimal')}
 **Preferred CTAs:** {', '.join(brand_profile.get('preferred_cta', []))}
 
-**Post Type:** {post_brief.get('post_type', 'single_image')}
-**Theme:** {post_brief.get('theme', '')}
-**Objective:** {post_brief.get('objective', '')}
-**Key Messages:** {', '.join(post_brief.get('key_messages', []))}
-**Target Emotion:** {post_brief.get('target_emotion', '')}
+**Requirements:**
+- Hook: Must be compelling, max 125 characters (appears before "more" button)
+- Caption: 125-300 words, match {brand_profile['tone']} tone
+- Hashtags: {hashtag_count} hashtags, avoid: {', '.join(hashtag_avoid) or 'generic, spammy'}
+- CTA: Choose from: {', '.join(brand_profile.get('preferred_cta', ['Learn more']))}
+- Alt text: Descriptive, max 100 characters
+- Creative brief: Detailed (at least 2-3 sentences)
+- Image prompt: Detailed visual description"""
 
-**Task:** Generate complete content for this Instagram post.
 
-Return ONLY valid JSON matching this schema:
-{{
+def post_schema(post_number: Any, post_type: str) -> str:
+    """JSON schema example for one generated post."""
+    return f"""{{
   "post_id": {post_number},
-  "type": "{post_brief.get('post_type', 'single_image')}",
+  "type": "{post_type}",
   "hook": "Attention-grabbing first line (max 125 chars, appears before 'more' button)",
   "caption": "Full caption text (125-300 words, match brand tone, include emojis per brand style)",
   "cta": "Call to action from preferred list",
@@ -58,49 +105,150 @@ Return ONLY valid JSON matching this schema:
   "alt_text": "Descriptive alt text for accessibility (max 100 chars)",
   "creative_brief": "Detailed instructions for image/video creation (what to show, how to shoot/design, style, mood)",
   "image_prompt": "AI image generation prompt (style, composition, lighting, mood - for guidance only, not generation)"
-}}
+}}"""
 
-**Requirements:**
-- Hook: Must be compelling, max 125 characters (appears before "more" button)
-- Caption: 125-300 words, match {brand_profile['tone']} tone
-- Hashtags: {hashtag_count} hashtags, avoid: {', '.join(hashtag_avoid) or 'generic, spammy'}
-- CTA: Choose from: {', '.join(brand_profile.get('preferred_cta', ['Learn more']))}
-- Alt text: Descriptive, max 100 characters
-- Creative brief: Detailed (at least 2-3 sentences)
-- Image prompt: Detailed visual description"""
-        
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2048,
-            temperature=0.5,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        text = response.content[0].text.strip()
-        
-        # Strip markdown fences
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1].rsplit("```", 1)[0].strip()
-        
-        post_content = json.loads(text)
-        
-        # Validate required fields
-        required = ["hook", "caption", "cta", "hashtags", "alt_text", "creative_brief", "image_prompt"]
-        missing = [f for f in required if f not in post_content]
-        if missing:
-            raise ValueError(f"Missing fields: {', '.join(missing)}")
-        
-        # Ensure post_id and type are set
-        post_content["post_id"] = post_number
-        post_content["type"] = post_brief.get("post_type", "single_image")
+
+def request_json(brand_profile: Dict[str, Any], prompt: str, max_tokens: int) -> Any:
+    """Send the cached brand preamble plus `prompt`; return the parsed JSON reply."""
+    response = get_client().messages.create(
+        model=MODEL,
+        max_tokens=max_tokens,
+        temperature=0.5,
+        messages=[{
+            "role": "user",
+            "content": [
+                {"type": "text", "text": build_brand_preamble(brand_profile), "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": prompt},
+            ]
+        }]
+    )
+    
+    text = response.content[0].text.strip()
+    
+    # Strip markdown fences
+    fenced = FENCE_RE.fullmatch(text)
+    if fenced:
+        text = fenced[1].strip()
+    
+    return json.loads(text)
+
+
+def finalize_post(post_content: Any, post_brief: Dict[str, Any], post_number: int) -> Dict[str, Any]:
+    """Validate a generated post (fields and types) and stamp its id and type."""
+    # Validate required fields and their types in one pass
+    if not isinstance(post_content, dict):
+        raise ValueError("Expected a JSON object")
+    missing = []
+    wrong_type = []
+    for field, expected in POST_FIELDS.items():
+        if field not in post_content:
+            missing.append(field)
+        elif not isinstance(post_content[field], expected):
+            wrong_type.append(field)
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    if wrong_type or not all(isinstance(tag, str) for tag in post_content["hashtags"]):
+        raise ValueError(f"Wrong field types: {', '.join(wrong_type) or 'hashtags'}")
+    
+    # Ensure post_id and type are set
+    post_content["post_id"] = post_number
+    post_content["type"] = post_brief.get("post_type", "single_image")
+    
+    return post_content
+
+
+def generate_single_post_with_llm(
+    post_brief: Dict[str, Any],
+    brand_profile: Dict[str, Any],
+    post_number: int
+) -> Dict[str, Any]:
+    """Generate content for a single post using Claude."""
+    try:
+        post_type = post_brief.get('post_type', 'single_image')
+        post_prompt = f"""**Post Type:** {post_type}
+**Theme:** {post_brief.get('theme', '')}
+**Objective:** {post_brief.get('objective', '')}
+**Key Messages:** {', '.join(post_brief.get('key_messages', []))}
+**Target Emotion:** {post_brief.get('target_emotion', '')}
+
+**Task:** Generate complete content for this ONE Instagram post.
+
+Return ONLY valid JSON matching this schema:
+{post_schema(post_number, post_type)}"""
         
-        return post_content
+        post_content = request_json(brand_profile, post_prompt, max_tokens=2048)
+        return finalize_post(post_content, post_brief, post_number)
         
     except Exception as e:
         logging.error(f"Failed to generate post {post_number}: {e}")
         raise
 
 
+def generate_all_posts_with_llm(
+    post_briefs: List[Dict[str, Any]],
+    brand_profile: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Generate every post in one Claude call that returns a JSON array.
+    
+    Raises if the reply isn't an array of one object per brief. Individual
+    posts that fail validation are regenerated on their own.
+    """
+    count = len(post_briefs)
+    briefs = [
+        {
+            "post_id": i,
+            "post_type": brief.get("post_type", "single_image"),
+            "theme": brief.get("theme", ""),
+            "objective": brief.get("objective", ""),
+            "key_messages": brief.get("key_messages", []),
+            "target_emotion": brief.get("target_emotion", ""),
+        }
+        for i, brief in enumerate(post_briefs, 1)
+    ]
+    prompt = f"""**Briefs:**
+{json.dumps(briefs, indent=2)}
+
+**Task:** Generate complete content for each of these {count} Instagram posts.
+
+Return ONLY a valid JSON array of {count} objects, one per brief, in the same
+order as the briefs, each matching this schema:
+{post_schema('<post_id from the brief>', '<post_type from the brief>')}"""
+    
+    logging.info(f"Using batched generation ({count} posts in one call)")
+    generated = request_json(brand_profile, prompt, max_tokens=min(2048 * count, MAX_BATCH_TOKENS))
+    if not isinstance(generated, list) or len(generated) != count:
+        raise ValueError(f"Expected a JSON array of {count} posts")
+    
+    posts = []
+    for i, (brief, post_content) in enumerate(zip(post_briefs, generated), 1):
+        try:
+            posts.append(finalize_post(post_content, brief, i))
+        except ValueError as e:
+            logging.warning(f"Batched post {i} invalid ({e}), regenerating it alone")
+            posts.append(generate_post_or_placeholder(brief, brand_profile, i))
+    return posts
+
+
+def generate_post_or_placeholder(
+    brief: Dict[str, Any],
+    brand_profile: Dict[str, Any],
+    post_number: int
+) -> Dict[str, Any]:
+    """Generate one post, returning a failed placeholder instead of raising."""
+    try:
+        return generate_single_post_with_llm(brief, brand_profile, post_number)
+    except Exception as e:
+        logging.error(f"Failed to generate post {post_number}: {e}")
+        # Add placeholder for failed post
+        return {
+            "post_id": post_number,
+            "type": brief.get("post_type", "single_image"),
+            "error": str(e),
+            "status": "failed"
+        }
+
+
 def generate_sequential(
     post_briefs: List[Dict[str, Any]],
     brand_profile: Dict[str, Any]
@@ -111,22 +259,30 @@ def generate_sequential(
     
     for i, brief in enumerate(post_briefs, 1):
         logging.info(f"Generating post {i}/{len(post_briefs)}")
-        try:
-            post = generate_single_post_with_llm(brief, brand_profile, i)
-            posts.append(post)
-        except Exception as e:
-            logging.error(f"Failed to generate post {i}: {e}")
-            # Add placeholder for failed post
-            posts.append({
-                "post_id": i,
-                "type": brief.get("post_type", "single_image"),
-                "error": str(e),
-                "status": "failed"
-            })
+        posts.append(generate_post_or_placeholder(brief, brand_profile, i))
     
     return posts
 
 
+def generate_parallel(
+    post_briefs: List[Dict[str, Any]],
+    brand_profile: Dict[str, Any],
+    max_concurrency: int
+) -> List[Dict[str, Any]]:
+    """Generate posts concurrently, returning them in brief order."""
+    workers = min(len(post_briefs), max_concurrency)
+    logging.info(f"Using parallel generation ({workers} workers)")
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # map() yields results in submission order, so post_id order is kept
+        return list(executor.map(
+            generate_post_or_placeholder,
+            post_briefs,
+            [brand_profile] * len(post_briefs),
+            range(1, len(post_briefs) + 1),
+        ))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate Instagram post content"
@@ -151,6 +307,22 @@ def main():
         action="store_true",
         help="Use Agent Teams for parallel generation (if 3+ posts)"
     )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help=f"Max posts generated at once (default {DEFAULT_MAX_CONCURRENCY}; 1 = sequential)"
+    )
+    parser.add_argument(
+        "--per-post",
+        action="store_true",
+        help="One LLM call per post instead of a single batched call"
+    )
+    parser.add_argument(
+        "--print-full",
+        action="store_true",
+        help="Echo the full output JSON to stdout instead of a summary"
+    )
     
     args = parser.parse_args()
     
@@ -170,15 +342,27 @@ def main():
         
         logging.info(f"Generating content for {len(post_briefs)} posts")
         
-        # Decide: parallel or sequential
+        # Decide: batched, parallel or sequential
         # Note: Agent Teams parallelization would be handled by Claude Code's native
-        # Agent Teams feature, not within this tool. This tool provides sequential
-        # generation. The workflow coordinator (Claude) can invoke this tool
-        # multiple times in parallel using Agent Teams.
+        # Agent Teams feature, not within this tool. Within a single invocation,
+        # small plans go out as one call returning every post; otherwise (or if
+        # the batched reply is unusable) each post is its own call, run on a
+        # thread pool since each one is independent and network-bound.
+        generated_posts = None
+        if not args.per_post and 1 < len(post_briefs) <= MAX_BATCH_POSTS:
+            try:
+                generated_posts = generate_all_posts_with_llm(post_briefs, brand_profile)
+                generation_mode = "batched"
+            except Exception as e:
+                logging.warning(f"Batched generation failed ({e}), falling back to per-post calls")
         
-        # For now, always use sequential within this tool
-        # The parallel speedup comes from the workflow coordinator
-        generated_posts = generate_sequential(post_briefs, brand_profile)
+        if generated_posts is None:
+            if args.max_concurrency > 1 and len(post_briefs) > 1:
+                generation_mode = "parallel"
+                generated_posts = generate_parallel(post_briefs, brand_profile, args.max_concurrency)
+            else:
+                generation_mode = "sequential"
+                generated_posts = generate_sequential(post_briefs, brand_profile)
         
         # Check for failures
         failed = [p for p in generated_posts if p.get("status") == "failed"]
@@ -192,7 +376,7 @@ def main():
                 "total_posts": len(generated_posts),
                 "successful": len(generated_posts) - len(failed),
                 "failed": len(failed),
-                "generation_mode": "sequential"
+                "generation_mode": generation_mode
             }
         }
         
@@ -203,7 +387,14 @@ def main():
         logging.info(
             f"Content generated: {output['metadata']['successful']}/{output['metadata']['total_posts']} successful"
         )
-        print(json.dumps(output, indent=2))
+        if args.print_full:
+            print(json.dumps(output, separators=(",", ":")))
+        else:
+            print(json.dumps({
+                "output": args.output,
+                "successful": output["metadata"]["successful"],
+                "failed": output["metadata"]["failed"]
+            }))
         
         # Exit with error if any posts failed
         return 1 if failed else 0
@@ -7,11 +7,24 @@ import argparse
 import json
 import logging
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
+# Write buffer for the checklist file (default is 8 KiB)
+WRITE_BUFFER_SIZE = 1 << 17
+
+
+def build_caption(post: dict) -> str:
+    """Assemble hook, caption, CTA and hashtags into the full post caption."""
+    return "\n\n".join((
+        post.get("hook", ""),
+        post.get("caption", ""),
+        post.get("cta", ""),
+        " ".join(post.get("hashtags") or ()),
+    ))
+
 
 def main():
     parser = argparse.ArgumentParser(description="Generate upload checklist")
@@ -24,30 +37,31 @@ def main():
         with open(args.generated_content) as f:
             content = json.load(f)
         
+        ok_posts = [p for p in content.get("posts", []) if p.get("status") != "failed"]
+        if not ok_posts:
+            logging.warning("No successful posts; skipping checklist")
+            print(json.dumps({"path": None, "skipped": True}, separators=(",", ":")))
+            return 0
+        
         output_dir = Path(args.output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        date_str = datetime.utcnow().strftime("%Y-%m-%d")
+        date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         
-        checklist = f"""# Instagram Upload Checklist - {date_str}
+        parts = [f"""# Instagram Upload Checklist - {date_str}
 
 Use this checklist to manually upload posts to Instagram.
 
-"""
+"""]
         
-        for post in content.get("posts", []):
-            if post.get("status") == "failed":
-                continue
-            
-            caption = f"{post.get('hook', '')}\n\n{post.get('caption', '')}\n\n{post.get('cta', '')}\n\n{' '.join(post.get('hashtags', []))}"
-            
-            checklist += f"""---
+        for post in ok_posts:
+            parts.append(f"""---
 
 ## [ ] Post {post['post_id']}: {post.get('type', 'unknown').upper()}
 
 **Caption (copy-paste):**
 ```
-{caption}
+{build_caption(post)}
 ```
 
 **Alt Text (copy-paste):**
@@ -61,13 +75,14 @@ Use this checklist to manually upload posts to Instagram.
 **Image Prompt:**
 {post.get('image_prompt', '')}
 
-"""
+""")
         
         path = output_dir / f"upload_checklist_{date_str}.md"
-        path.write_text(checklist)
+        with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            f.writelines(parts)
         
         logging.info(f"Upload checklist generated: {path}")
-        print(json.dumps({"path": str(path)}, indent=2))
+        print(json.dumps({"path": str(path)}, separators=(",", ":")))
         return 0
         
     except Exception as e:
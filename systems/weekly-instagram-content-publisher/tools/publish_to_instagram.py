@@ -7,6 +7,7 @@ Falls back to manual pack generation on failures.
 """
 
 import argparse
+import asyncio
 import json
 import logging
 import os
@@ -14,25 +15,145 @@ import sys
 import time
 from typing import Any, Dict, List
 
+import httpx
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
+# Graph API allows 200 calls per user per hour. Calls are spaced evenly at
+# that rate (one every 18 s), with no burst beyond the first call, so
+# concurrent posts can't front-load the quota and trip a 429
+CALLS_PER_HOUR = 200
+BURST_CALLS = 1
+
+# Rate-limited (429) calls are retried this many times, but only when the
+# server asks for a wait of at most MAX_RETRY_DELAY seconds; longer waits
+# (e.g. the hourly quota) end the run as rate limited
+MAX_RETRIES = 2
+MAX_RETRY_DELAY = 30
+
+# Instagram's caption length limit
+MAX_CAPTION_CHARS = 2200
+
+
+class TokenBucket:
+    """Async token bucket: up to `burst` calls at once, refilled at a fixed rate."""
+    
+    def __init__(self, rate_per_hour: float = CALLS_PER_HOUR, burst: int = BURST_CALLS):
+        self.rate = rate_per_hour / 3600  # tokens per second
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a call may be made, then take a token."""
+        # Holding the lock while sleeping keeps waiters in FIFO order
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+    
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for `seconds` (e.g. after a 429)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def build_caption(post: Dict[str, Any], max_len: int = MAX_CAPTION_CHARS) -> str:
+    """Assemble hook, caption, CTA and hashtags, truncated to max_len."""
+    caption = "\n\n".join((
+        post.get("hook", ""),
+        post.get("caption", ""),
+        post.get("cta", ""),
+        " ".join(post.get("hashtags") or ()),
+    ))
+    if len(caption) > max_len:
+        logging.warning(f"Post {post['post_id']} caption truncated from {len(caption)} to {max_len} chars")
+        caption = caption[:max_len - 3] + "..."
+    return caption
+
+
+async def post_with_retry(
+    client: httpx.AsyncClient,
+    bucket: TokenBucket,
+    url: str,
+    params: Dict[str, Any],
+    headers: Dict[str, str]
+) -> httpx.Response:
+    """
+    POST once the rate limiter allows, retrying short 429s.
+    
+    A 429 pauses the shared bucket for Retry-After (or an exponential
+    backoff), so every in-flight post waits rather than just this one.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        await bucket.acquire()
+        resp = await client.post(url, params=params, headers=headers)
+        if resp.status_code != 429 or attempt == MAX_RETRIES:
+            break
+        
+        retry_after = resp.headers.get("Retry-After")
+        try:
+            delay = float(retry_after) if retry_after else 2 ** (attempt + 1)
+        except ValueError:
+            delay = 2 ** (attempt + 1)
+        if delay > MAX_RETRY_DELAY:
+            break
+        
+        logging.warning(f"Rate limited, retrying in {delay:.0f}s")
+        bucket.pause(delay)
+    
+    resp.raise_for_status()
+    return resp
+
+
+def skipped_result(post: Dict[str, Any]) -> Dict[str, Any]:
+    """Result for a post not attempted because the rate limit was hit."""
+    return {
+        "post_id": post["post_id"],
+        "status": "skipped",
+        "error": "Skipped due to rate limit"
+    }
 
-def publish_post(
+
+async def publish_post(
+    client: httpx.AsyncClient,
+    bucket: TokenBucket,
     post: Dict[str, Any],
     access_token: str,
-    ig_user_id: str
+    ig_user_id: str,
+    turn: asyncio.Event,
+    done: asyncio.Event,
+    rate_limited: asyncio.Event
 ) -> Dict[str, Any]:
-    """Publish a single post to Instagram."""
+    """
+    Publish a single post to Instagram.
+    
+    Its media container is created while earlier posts are still in flight
+    (paced by `bucket`); the publish call then waits for `turn` (set when the
+    previous post finishes) so posts go live in order. `done` is set on
+    return, whatever the outcome.
+    """
+    # Token goes in a header rather than the query string, keeping it out of
+    # URLs (and any logs of them)
+    auth_headers = {"Authorization": f"Bearer {access_token}"}
+    
     try:
-        import httpx
+        if rate_limited.is_set():
+            return skipped_result(post)
         
-        # Format caption (hook + caption + CTA + hashtags)
-        caption = f"{post.get('hook', '')}\n\n{post.get('caption', '')}\n\n{post.get('cta', '')}\n\n{' '.join(post.get('hashtags', []))}"
+        logging.info(f"Publishing post {post['post_id']}")
         
-        # Truncate if over 2200 chars
-        if len(caption) > 2200:
-            logging.warning(f"Post {post['post_id']} caption truncated from {len(caption)} to 2200 chars")
-            caption = caption[:2197] + "..."
+        caption = build_caption(post)
         
         # NOTE: Instagram Graph API requires publicly accessible HTTPS URLs for media
         # This tool creates a TEXT-ONLY post as a placeholder
@@ -40,33 +161,29 @@ def publish_post(
         
         # Create media container (simplified - text only)
         create_url = f"https://graph.facebook.com/v18.0/{ig_user_id}/media"
-        create_params = {
-            "caption": caption,
-            "access_token": access_token
-        }
+        create_params = {"caption": caption}
         
         # If media_url is provided, include it
         if "media_url" in post:
             create_params["image_url"] = post["media_url"]
             create_params["media_type"] = "IMAGE"
         
-        resp = httpx.post(create_url, params=create_params, timeout=30)
-        resp.raise_for_status()
+        resp = await post_with_retry(client, bucket, create_url, create_params, auth_headers)
         container = resp.json()
         container_id = container.get("id")
         
         if not container_id:
             raise ValueError("No container ID returned")
         
-        # Publish media container
+        # Publish media container, in post order
+        await turn.wait()
+        if rate_limited.is_set():
+            return skipped_result(post)
+        
         publish_url = f"https://graph.facebook.com/v18.0/{ig_user_id}/media_publish"
-        publish_params = {
-            "creation_id": container_id,
-            "access_token": access_token
-        }
+        publish_params = {"creation_id": container_id}
         
-        resp = httpx.post(publish_url, params=publish_params, timeout=30)
-        resp.raise_for_status()
+        resp = await post_with_retry(client, bucket, publish_url, publish_params, auth_headers)
         result = resp.json()
         
         return {
@@ -79,6 +196,7 @@ def publish_post(
     except httpx.HTTPStatusError as e:
         status = e.response.status_code
         if status == 429:
+            rate_limited.set()
             return {
                 "post_id": post["post_id"],
                 "status": "rate_limited",
@@ -103,6 +221,37 @@ def publish_post(
             "status": "failed",
             "error": str(e)
         }
+    finally:
+        done.set()
+
+
+async def publish_all(
+    posts: List[Dict[str, Any]],
+    access_token: str,
+    ig_user_id: str
+) -> List[Dict[str, Any]]:
+    """
+    Publish posts concurrently, with API calls paced by one token bucket.
+    
+    Results come back in post order. Once any call is rate limited, posts
+    that haven't reached that call yet are skipped.
+    """
+    bucket = TokenBucket()
+    rate_limited = asyncio.Event()
+    turn = asyncio.Event()
+    turn.set()  # first post may publish as soon as its container exists
+    
+    limits = httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60)
+    async with httpx.AsyncClient(http2=True, timeout=httpx.Timeout(30.0), limits=limits) as client:
+        tasks = []
+        for post in posts:
+            done = asyncio.Event()
+            tasks.append(publish_post(
+                client, bucket, post, access_token, ig_user_id,
+                turn, done, rate_limited
+            ))
+            turn = done
+        return await asyncio.gather(*tasks)
 
 
 def main():
@@ -119,6 +268,11 @@ def main():
         default="publish_log.json",
         help="Output file path"
     )
+    parser.add_argument(
+        "--print-full",
+        action="store_true",
+        help="Echo the full output JSON to stdout instead of a summary"
+    )
     
     args = parser.parse_args()
     
@@ -140,32 +294,16 @@ def main():
         
         logging.info(f"Publishing {len(successful_posts)} posts to Instagram")
         
-        results = []
-        rate_limited = False
-        
-        for post in successful_posts:
-            if rate_limited:
-                results.append({
-                    "post_id": post["post_id"],
-                    "status": "skipped",
-                    "error": "Skipped due to rate limit"
-                })
-                continue
-            
-            logging.info(f"Publishing post {post['post_id']}")
-            result = publish_post(post, access_token, ig_user_id)
-            results.append(result)
-            
+        results = asyncio.run(publish_all(successful_posts, access_token, ig_user_id))
+        
+        # Log after the gather so output order matches post order
+        for result in results:
             if result["status"] == "success":
-                logging.info(f"✓ Published post {post['post_id']}")
+                logging.info(f"✓ Published post {result['post_id']}")
             elif result["status"] == "rate_limited":
-                logging.error(f"✗ Rate limit hit at post {post['post_id']}")
-                rate_limited = True
-            else:
-                logging.error(f"✗ Failed to publish post {post['post_id']}: {result.get('error')}")
-            
-            # Small delay between posts
-            time.sleep(2)
+                logging.error(f"✗ Rate limit hit at post {result['post_id']}")
+            elif result["status"] != "skipped":
+                logging.error(f"✗ Failed to publish post {result['post_id']}: {result.get('error')}")
         
         # Compile publish log
         publish_log = {
@@ -188,7 +326,10 @@ def main():
         logging.info(
             f"Publish complete: {publish_log['summary']['successful']}/{publish_log['summary']['total']} successful"
         )
-        print(json.dumps(publish_log, indent=2))
+        if args.print_full:
+            print(json.dumps(publish_log, separators=(",", ":")))
+        else:
+            print(json.dumps({"output": args.output, **publish_log["summary"]}))
         
         # Exit with error if any failures
         if publish_log['summary']['failed'] > 0 or publish_log['summary']['rate_limited'] > 0:
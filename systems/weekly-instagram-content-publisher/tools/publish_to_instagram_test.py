@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import publish_to_instagram
+from publish_to_instagram import TokenBucket
+
+
+class FakeClock:
+    """Stands in for time.monotonic and asyncio.sleep; sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patches = [
+            mock.patch.object(publish_to_instagram.time, "monotonic", self.clock.monotonic),
+            mock.patch.object(publish_to_instagram.asyncio, "sleep", self.clock.sleep),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def acquire(self, bucket, times=1):
+        async def run():
+            for _ in range(times):
+                await bucket.acquire()
+        asyncio.run(run())
+
+    def test_burst_is_immediate(self):
+        bucket = TokenBucket(rate_per_hour=3600, burst=3)
+        self.acquire(bucket, 3)
+        self.assertEqual(self.clock.sleeps, [])
+        self.assertAlmostEqual(bucket.tokens, 0)
+
+    def test_empty_bucket_waits_for_refill(self):
+        bucket = TokenBucket(rate_per_hour=3600, burst=2)
+        self.acquire(bucket, 3)
+        self.assertEqual(len(self.clock.sleeps), 1)
+        self.assertAlmostEqual(self.clock.sleeps[0], 1.0)
+
+    def test_refill_capped_at_burst(self):
+        bucket = TokenBucket(rate_per_hour=3600, burst=2)
+        self.acquire(bucket, 2)
+        self.clock.now += 60
+        self.acquire(bucket, 2)
+        self.assertEqual(self.clock.sleeps, [])
+        self.acquire(bucket)
+        self.assertAlmostEqual(sum(self.clock.sleeps), 1.0)
+
+    def test_default_bucket_spaces_calls(self):
+        bucket = TokenBucket()
+        self.acquire(bucket, 3)
+        self.assertEqual(len(self.clock.sleeps), 2)
+        self.assertAlmostEqual(sum(self.clock.sleeps), 2 * 3600 / publish_to_instagram.CALLS_PER_HOUR)
+
+    def test_pause_holds_callers(self):
+        bucket = TokenBucket(rate_per_hour=3600, burst=5)
+        bucket.pause(30)
+        self.acquire(bucket)
+        self.assertAlmostEqual(self.clock.sleeps[0], 30)
+
+    def test_shorter_pause_does_not_shorten(self):
+        bucket = TokenBucket(rate_per_hour=3600, burst=5)
+        bucket.pause(30)
+        bucket.pause(5)
+        self.assertAlmostEqual(bucket.paused_until, self.clock.now + 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
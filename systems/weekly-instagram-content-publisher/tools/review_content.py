@@ -13,86 +13,85 @@ Returns overall score and pass/fail decision (pass >= 80, compliance == 100, cla
 """
 
 import argparse
+import asyncio
+import hashlib
 import json
 import logging
 import os
+import re
 import sys
-from typing import Any, Dict, List
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Pattern, Tuple
 
-logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+import anthropic
 
+LOG_LEVEL = logging.getLevelName(os.environ.get("LOG_LEVEL", "WARNING").upper())
+logging.basicConfig(
+    level=LOG_LEVEL if isinstance(LOG_LEVEL, int) else logging.WARNING,
+    format="%(levelname)s: %(message)s"
+)
 
-def score_with_llm(
-    generated_content: Dict[str, Any],
-    brand_profile: Dict[str, Any],
-    reference_content: Dict[str, Any]
-) -> Dict[str, Any]:
-    """Score content using Claude across all dimensions."""
-    try:
-        import anthropic
-        
-        client = anthropic.Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
-        
-        # Compile posts for review
-        posts_text = "\n\n".join(
-            f"**Post {p['post_id']}** ({p['type']})\n"
-            f"Hook: {p.get('hook', '')}\n"
-            f"Caption: {p.get('caption', '')[:200]}...\n"
-            f"CTA: {p.get('cta', '')}\n"
-            f"Hashtags: {', '.join(p.get('hashtags', []))}"
-            for p in generated_content.get("posts", [])
-            if p.get("status") != "failed"
-        )
-        
-        # Compile reference facts
-        ref_text = "\n\n".join(
-            f"Source: {r['url']}\n{r['content'][:500]}"
-            for r in reference_content.get("reference_content", [])
-            if r.get("success")
-        ) or "No reference material."
-        
-        prompt = f"""You are a content quality reviewer. Score the generated Instagram posts across 5 dimensions.
+# Markdown code fence around an LLM reply, with optional language tag
+FENCE_RE = re.compile(r"```[\w-]*[ \t]*\n(.*?)\n?```", re.DOTALL)
 
-**Brand Profile:**
-- Brand: {brand_profile['brand_name']}
-- Tone: {brand_profile['tone']}
-- Target Audience: {brand_profile['target_audience']}
-- Banned Topics: {', '.join(brand_profile.get('banned_topics', []))}
-- Prohibited Claims: {', '.join(brand_profile.get('prohibited_claims', []))}
-- Preferred CTAs: {', '.join(brand_profile.get('preferred_cta', []))}
-- Hashtag Preferences: {json.dumps(brand_profile.get('hashtag_preferences', {}))}
+MODEL = "claude-sonnet-4-20250514"
 
-**Generated Posts:**
-{posts_text}
+# Scored dimensions, in report order
+DIMENSIONS = ("brand_voice", "compliance", "hashtags", "format", "claims")
 
-**Reference Material:**
-{ref_text}
+# Hard length limits checked locally (the same ones the rubric's format
+# criteria list); each violation costs the format score 10 points
+FORMAT_LIMITS = (("caption", 2200), ("hook", 125), ("alt_text", 100))
+FORMAT_PENALTY = 10
+
+# Reviews are cached here keyed on a hash of every input (and the rubric),
+# so reruns over byte-identical content skip the LLM call
+CACHE_DIR = Path.home() / ".cache" / "ig_content_publisher" / "review"
+
+# Budget for reference material in the review prompt (each source is
+# already cut to 500 chars); later sources are dropped once it is spent
+MAX_REF_CHARS = 8000
+
+# Reviews in flight at once when scoring a --brands-manifest
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Message Batches polling (--batch): check every BATCH_POLL_INTERVAL seconds,
+# giving up (and cancelling) after BATCH_MAX_WAIT seconds
+BATCH_POLL_INTERVAL = 30
+BATCH_MAX_WAIT = 3600
+
+
+# Static instructions, schema and scoring rubric. Sent as a cached system
+# block ahead of the per-run brand, posts and references, so retries and
+# later runs reuse the prefix.
+SCORING_RUBRIC = """You are a content quality reviewer. Score the generated Instagram posts across 5 dimensions.
 
 **Task:** Score each dimension (0-100) and provide specific issues found.
 
 Return ONLY valid JSON matching this schema:
-{{
-  "brand_voice": {{
+{
+  "brand_voice": {
     "score": 90,
     "issues": ["Post 3 uses slightly formal language"]
-  }},
-  "compliance": {{
+  },
+  "compliance": {
     "score": 100,
     "issues": []
-  }},
-  "hashtags": {{
+  },
+  "hashtags": {
     "score": 85,
     "issues": ["Post 2 uses generic hashtag #love"]
-  }},
-  "format": {{
+  },
+  "format": {
     "score": 95,
     "issues": []
-  }},
-  "claims": {{
+  },
+  "claims": {
     "score": 100,
     "issues": []
-  }}
-}}
+  }
+}
 
 **Scoring Criteria:**
 
@@ -130,77 +129,484 @@ Score: 80+ to pass
 - Score MUST be 100 to pass
 
 List ALL issues found. Be thorough but fair."""
-        
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=3072,
-            temperature=0.0,
-            messages=[{"role": "user", "content": prompt}]
+
+
+# Per-run half of the review prompt, filled by build_review_prompt
+REVIEW_TEMPLATE = """**Brand Profile:**
+- Brand: {brand_name}
+- Tone: {tone}
+- Target Audience: {target_audience}
+- Banned Topics: {banned_topics}
+- Prohibited Claims: {prohibited_claims}
+- Preferred CTAs: {preferred_cta}
+- Hashtag Preferences: {hashtag_preferences}
+
+**Generated Posts:**
+{posts_text}
+
+**Reference Material:**
+{ref_text}"""
+
+
+# One post / one reference source in the review prompt: (post_id, type, hook,
+# caption[:200], cta, hashtags) and (url, content[:500])
+POST_TEMPLATE = "**Post {0}** ({1})\nHook: {2}\nCaption: {3}...\nCTA: {4}\nHashtags: {5}"
+REF_TEMPLATE = "Source: {0}\n{1}"
+
+# Appended to the prompt when check_format has already scored the format
+# dimension, so the model doesn't spend output tokens on it
+FORMAT_NOTE = """
+
+**Note:** Format has already been scored by a local length check. Return "format": {"score": 0, "issues": []} and score the other four dimensions."""
+
+
+_client = None
+
+
+def get_client() -> anthropic.Anthropic:
+    """Return the shared Anthropic client, so retries reuse its connection pool."""
+    global _client
+    if _client is None:
+        _client = anthropic.Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+    return _client
+
+
+def review_params(prompt: str) -> Dict[str, Any]:
+    """Messages API parameters for one review request (sync or batched)."""
+    return {
+        "model": MODEL,
+        "max_tokens": 3072,
+        "temperature": 0.0,
+        "system": [
+            {"type": "text", "text": SCORING_RUBRIC, "cache_control": {"type": "ephemeral"}}
+        ],
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+def batch_custom_id(brand_profile: Dict[str, Any], index: int) -> str:
+    """Batch request id for one job: review-<n>-<brand>-<date>, within API limits."""
+    brand = re.sub(r"[^a-zA-Z0-9_-]+", "-", brand_profile.get("brand_name", "brand")).strip("-")
+    return f"review-{index}-{brand[:40]}-{time.strftime('%Y-%m-%d', time.gmtime())}"
+
+
+def build_review_prompt(
+    generated_content: Dict[str, Any],
+    brand_profile: Dict[str, Any],
+    reference_content: Dict[str, Any]
+) -> str:
+    """Build the per-run part of the review prompt (SCORING_RUBRIC is the rest)."""
+    # Compile posts for review
+    posts_text = "\n\n".join([
+        POST_TEMPLATE.format(
+            p["post_id"], p["type"], p.get("hook", ""), p.get("caption", "")[:200],
+            p.get("cta", ""), ", ".join(p.get("hashtags", ()))
         )
-        
-        text = response.content[0].text.strip()
-        
-        # Strip markdown fences
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1].rsplit("```", 1)[0].strip()
-        
-        scores = json.loads(text)
-        
-        # Calculate overall score
-        dimension_scores = [
-            scores.get("brand_voice", {}).get("score", 0),
-            scores.get("compliance", {}).get("score", 0),
-            scores.get("hashtags", {}).get("score", 0),
-            scores.get("format", {}).get("score", 0),
-            scores.get("claims", {}).get("score", 0)
-        ]
-        overall_score = sum(dimension_scores) / len(dimension_scores)
-        
-        # Determine pass/fail
-        compliance_ok = scores.get("compliance", {}).get("score", 0) == 100
-        claims_ok = scores.get("claims", {}).get("score", 0) == 100
-        overall_ok = overall_score >= 80
-        
-        pass_fail = "PASS" if (overall_ok and compliance_ok and claims_ok) else "FAIL"
-        
-        # Compile result
-        result = {
-            "scores": scores,
-            "overall_score": round(overall_score, 1),
-            "pass_fail": pass_fail,
-            "pass_criteria": {
-                "overall_80": overall_ok,
-                "compliance_100": compliance_ok,
-                "claims_100": claims_ok
-            }
+        for p in generated_content.get("posts", [])
+        if p.get("status") != "failed"
+    ])
+    
+    # Compile reference facts, once per URL and within MAX_REF_CHARS overall
+    seen = set()
+    refs = []
+    total_chars = 0
+    for r in reference_content.get("reference_content", []):
+        if not r.get("success") or r["url"] in seen:
+            continue
+        seen.add(r["url"])
+        ref = REF_TEMPLATE.format(r["url"], r["content"][:500])
+        if total_chars + len(ref) > MAX_REF_CHARS:
+            break
+        refs.append(ref)
+        total_chars += len(ref)
+    logging.info(f"Reference material: {len(refs)} sources, {total_chars} chars")
+    ref_text = "\n\n".join(refs) or "No reference material."
+    
+    prompt = REVIEW_TEMPLATE.format_map({
+        "brand_name": brand_profile["brand_name"],
+        "tone": brand_profile["tone"],
+        "target_audience": brand_profile["target_audience"],
+        "banned_topics": ", ".join(brand_profile.get("banned_topics", [])),
+        "prohibited_claims": ", ".join(brand_profile.get("prohibited_claims", [])),
+        "preferred_cta": ", ".join(brand_profile.get("preferred_cta", [])),
+        "hashtag_preferences": json.dumps(brand_profile.get("hashtag_preferences", {})),
+        "posts_text": posts_text,
+        "ref_text": ref_text,
+    })
+    if check_format(generated_content) is not None:
+        prompt += FORMAT_NOTE
+    return prompt
+
+
+def compile_banned_re(brand_profile: Dict[str, Any]) -> Optional[Pattern[str]]:
+    """One case-insensitive whole-word pattern over banned topics and prohibited claims."""
+    terms = [
+        t.strip() for t in
+        brand_profile.get("banned_topics", []) + brand_profile.get("prohibited_claims", [])
+        if t.strip()
+    ]
+    if not terms:
+        return None
+    alternation = "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+
+
+def prescreen_compliance(
+    generated_content: Dict[str, Any],
+    brand_profile: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Check posts locally for banned topics and prohibited claims used verbatim.
+    
+    Returns:
+        A FAIL review listing the hits, or None if nothing matched and the
+        posts need a full LLM review.
+    """
+    banned_re = compile_banned_re(brand_profile)
+    if banned_re is None:
+        return None
+    
+    issues = []
+    for p in generated_content.get("posts", []):
+        if p.get("status") == "failed":
+            continue
+        text = "\n".join((p.get("hook", ""), p.get("caption", ""), p.get("cta", "")))
+        hits = sorted({m.group(0).lower() for m in banned_re.finditer(text)})
+        if hits:
+            issues.append(f"Post {p.get('post_id')} contains banned term(s): {', '.join(hits)}")
+    
+    if not issues:
+        return None
+    
+    not_scored = {"score": 0, "issues": ["Not scored: failed local compliance pre-screen"]}
+    return {
+        "scores": {
+            "brand_voice": not_scored,
+            "compliance": {"score": 0, "issues": issues},
+            "hashtags": not_scored,
+            "format": not_scored,
+            "claims": not_scored
+        },
+        "overall_score": 0,
+        "pass_fail": "FAIL",
+        "pass_criteria": {
+            "overall_80": False,
+            "compliance_100": False,
+            "claims_100": False
+        },
+        "prescreen": True
+    }
+
+
+def check_format(generated_content: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Score the format dimension locally from the hard length limits.
+    
+    Returns:
+        The format entry ({score, issues}) if any post breaks a limit, else
+        None and format is left to the LLM review.
+    """
+    issues = [
+        f"Post {p.get('post_id')}: {field} is {len(p.get(field) or '')} chars (max {limit})"
+        for p in generated_content.get("posts", [])
+        if p.get("status") != "failed"
+        for field, limit in FORMAT_LIMITS
+        if len(p.get(field) or "") > limit
+    ]
+    if not issues:
+        return None
+    return {"score": max(0, 100 - FORMAT_PENALTY * len(issues)), "issues": issues}
+
+
+def parse_review(text: str, local_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Parse the model's scores and compute the overall score and pass/fail.
+    
+    Args:
+        text: The model's reply
+        local_format: check_format's result, used in place of the model's
+            format score when given
+    """
+    text = text.strip()
+    
+    # Strip markdown fences
+    fenced = FENCE_RE.fullmatch(text)
+    if fenced:
+        text = fenced[1].strip()
+    
+    raw = json.loads(text)
+    if not isinstance(raw, dict):
+        raise ValueError("Review is not a JSON object")
+    
+    # Check the shape once, keeping only the expected dimensions; a
+    # malformed reply raises so the caller retries instead of scoring it
+    scores = {}
+    for dim in DIMENSIONS:
+        if dim == "format" and local_format is not None:
+            scores[dim] = local_format
+            continue
+        entry = raw.get(dim)
+        if not isinstance(entry, dict):
+            raise ValueError(f"Missing dimension: {dim}")
+        score, issues = entry.get("score"), entry.get("issues", [])
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0 <= score <= 100:
+            raise ValueError(f"Invalid score for {dim}: {score!r}")
+        if not isinstance(issues, list):
+            raise ValueError(f"Invalid issues for {dim}")
+        scores[dim] = {"score": score, "issues": issues}
+    
+    # Calculate overall score
+    overall_score = sum(entry["score"] for entry in scores.values()) / len(DIMENSIONS)
+    
+    # Determine pass/fail
+    compliance_ok = scores["compliance"]["score"] == 100
+    claims_ok = scores["claims"]["score"] == 100
+    overall_ok = overall_score >= 80
+    
+    pass_fail = "PASS" if (overall_ok and compliance_ok and claims_ok) else "FAIL"
+    
+    # Compile result
+    result = {
+        "scores": scores,
+        "overall_score": round(overall_score, 1),
+        "pass_fail": pass_fail,
+        "pass_criteria": {
+            "overall_80": overall_ok,
+            "compliance_100": compliance_ok,
+            "claims_100": claims_ok
         }
+    }
+    
+    return result
+
+
+async def score_with_llm(
+    client: anthropic.AsyncAnthropic,
+    semaphore: asyncio.Semaphore,
+    generated_content: Dict[str, Any],
+    brand_profile: Dict[str, Any],
+    reference_content: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Score content using Claude across all dimensions."""
+    try:
+        prompt = build_review_prompt(generated_content, brand_profile, reference_content)
+        # Stream so the body is consumed as it is generated rather than in
+        # one read at the end
+        async with semaphore:
+            async with client.messages.stream(**review_params(prompt)) as stream:
+                text = "".join([chunk async for chunk in stream.text_stream])
         
-        return result
+        return parse_review(text, check_format(generated_content))
         
     except Exception as e:
         logging.error(f"Review failed: {e}")
         raise
 
 
+def score_with_llm_batch(jobs: List[Tuple[str, str, Optional[Dict[str, Any]]]]) -> Dict[str, Any]:
+    """
+    Score several reviews through the Message Batches API (half the token
+    cost of synchronous calls, but results can take minutes to arrive).
+    
+    Args:
+        jobs: (custom_id, prompt, local_format) triples, local_format being
+            check_format's result; custom_ids must be unique
+    
+    Returns:
+        custom_id -> parsed review, or the Exception that job failed with.
+    """
+    client = get_client()
+    
+    batch = client.messages.batches.create(requests=[
+        {"custom_id": custom_id, "params": review_params(prompt)}
+        for custom_id, prompt, _ in jobs
+    ])
+    logging.info(f"Submitted review batch {batch.id} ({len(jobs)} request(s))")
+    
+    deadline = time.monotonic() + BATCH_MAX_WAIT
+    while client.messages.batches.retrieve(batch.id).processing_status != "ended":
+        if time.monotonic() > deadline:
+            client.messages.batches.cancel(batch.id)
+            raise TimeoutError(f"Review batch {batch.id} did not finish in {BATCH_MAX_WAIT}s")
+        time.sleep(BATCH_POLL_INTERVAL)
+    
+    local_formats = {custom_id: local_format for custom_id, _, local_format in jobs}
+    results: Dict[str, Any] = {}
+    for entry in client.messages.batches.results(batch.id):
+        if entry.result.type == "succeeded":
+            try:
+                results[entry.custom_id] = parse_review(
+                    entry.result.message.content[0].text, local_formats.get(entry.custom_id)
+                )
+            except Exception as e:
+                results[entry.custom_id] = e
+        else:
+            results[entry.custom_id] = RuntimeError(f"Batch request {entry.result.type}")
+    
+    # Anything the batch didn't report on counts as failed
+    for custom_id, _, _ in jobs:
+        results.setdefault(custom_id, RuntimeError("Missing from batch results"))
+    return results
+
+
+def review_cache_path(
+    generated: Dict[str, Any],
+    brand_profile: Dict[str, Any],
+    references: Dict[str, Any]
+) -> Path:
+    """Cache file for these exact inputs, model, rubric and format limits."""
+    key_data = json.dumps({
+        "model": MODEL,
+        "rubric": SCORING_RUBRIC,
+        "format_limits": FORMAT_LIMITS,
+        "generated": generated,
+        "bp": brand_profile,
+        "refs": references,
+    }, sort_keys=True, separators=(",", ":"))
+    key = hashlib.blake2b(key_data.encode("utf-8"), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+def load_cached_review(cache_path: Path) -> Optional[Dict[str, Any]]:
+    """Return the cached review, or None on a miss or unreadable entry."""
+    try:
+        return json.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_review(cache_path: Path, review: Dict[str, Any]) -> None:
+    """Store a review in the cache atomically; failures only cost the next run a call."""
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(json.dumps(review, separators=(",", ":")).encode("utf-8"))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logging.warning(f"Could not write review cache: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+
+def failed_review(error: Exception) -> Dict[str, Any]:
+    """Conservative FAIL result for a review that could not be completed."""
+    return {
+        "scores": {
+            "brand_voice": {"score": 0, "issues": ["Review failed"]},
+            "compliance": {"score": 0, "issues": ["Review failed"]},
+            "hashtags": {"score": 0, "issues": ["Review failed"]},
+            "format": {"score": 0, "issues": ["Review failed"]},
+            "claims": {"score": 0, "issues": ["Review failed"]}
+        },
+        "overall_score": 0,
+        "pass_fail": "FAIL",
+        "pass_criteria": {
+            "overall_80": False,
+            "compliance_100": False,
+            "claims_100": False
+        },
+        "error": str(error)
+    }
+
+
+async def review_with_retries(
+    client: anthropic.AsyncAnthropic,
+    semaphore: asyncio.Semaphore,
+    job: Dict[str, Any],
+    retries: int
+) -> Dict[str, Any]:
+    """Score one job, retrying on failure; falls back to failed_review."""
+    for attempt in range(1, retries + 2):
+        try:
+            logging.info(f"Running quality review for {job['output']} (attempt {attempt}/{retries + 1})")
+            return await score_with_llm(client, semaphore, *job["inputs"])
+        except Exception as e:
+            if attempt > retries:
+                logging.error(f"Review failed after {attempt} attempts")
+                return failed_review(e)
+            logging.warning(f"Attempt {attempt} failed: {e}. Retrying...")
+
+
+async def review_all(jobs: List[Dict[str, Any]], retries: int, max_concurrency: int) -> List[Dict[str, Any]]:
+    """Score every job concurrently, at most max_concurrency requests in flight."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async with anthropic.AsyncAnthropic(api_key=os.environ["ANTHROPIC_API_KEY"]) as client:
+        return await asyncio.gather(*(
+            review_with_retries(client, semaphore, job, retries) for job in jobs
+        ))
+
+
+def review_all_batch(jobs: List[Dict[str, Any]], retries: int) -> List[Dict[str, Any]]:
+    """Score every job in one Message Batch, resubmitting failed jobs on retry."""
+    reviews: Dict[int, Dict[str, Any]] = {}
+    
+    # Build each request up front, so a job with malformed inputs fails on
+    # its own instead of taking the whole batch down with it
+    requests: Dict[int, Tuple[str, str, Optional[Dict[str, Any]]]] = {}
+    for i, job in enumerate(jobs):
+        try:
+            requests[i] = (
+                batch_custom_id(job["inputs"][1], i),
+                build_review_prompt(*job["inputs"]),
+                check_format(job["inputs"][0])
+            )
+        except Exception as e:
+            logging.error(f"Could not build review request for {job['output']}: {e}")
+            reviews[i] = failed_review(e)
+    
+    pending = list(requests)
+    for attempt in range(1, retries + 2):
+        if not pending:
+            break
+        logging.info(f"Running quality review batch of {len(pending)} (attempt {attempt}/{retries + 1})")
+        ids = {requests[i][0]: i for i in pending}
+        try:
+            results = score_with_llm_batch([requests[i] for i in pending])
+        except Exception as e:
+            logging.error(f"Review batch failed: {e}")
+            results = {custom_id: e for custom_id in ids}
+        
+        pending = []
+        for custom_id, i in ids.items():
+            result = results[custom_id]
+            if not isinstance(result, Exception):
+                reviews[i] = result
+            elif attempt > retries:
+                logging.error(f"Review of {jobs[i]['output']} failed after {attempt} attempts")
+                reviews[i] = failed_review(result)
+            else:
+                logging.warning(f"Review of {jobs[i]['output']} failed: {result}. Retrying...")
+                pending.append(i)
+    
+    return [reviews[i] for i in range(len(jobs))]
+
+
+def write_review(output: str, review: Dict[str, Any]) -> None:
+    """Write the review report (indented, for people and jq) and echo it compactly."""
+    Path(output).write_bytes(json.dumps(review, indent=2).encode("utf-8"))
+    print(json.dumps(review, separators=(",", ":")))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Review Instagram content quality"
     )
     parser.add_argument(
         "--generated-content",
-        required=True,
         help="Path to generated content JSON"
     )
     parser.add_argument(
         "--brand-profile",
-        required=True,
         help="Path to brand profile JSON"
     )
     parser.add_argument(
         "--reference-content",
-        required=True,
         help="Path to reference content JSON"
     )
+    parser.add_argument(
+        "--brands-manifest",
+        help="JSON array of {generated_content, brand_profile, reference_content, output} "
+             "paths to review together instead of the three inputs above"
+    )
     parser.add_argument(
         "--output",
         default="review_report.json",
@@ -212,65 +618,105 @@ def main():
         default=2,
         help="Number of retries on failure"
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Score via the Message Batches API (50%% cheaper, slower); for non-interactive runs"
+    )
+    parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=not os.environ.get("CI"),
+        help="Reuse reviews for identical inputs (default: on, off when CI is set)"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help="Maximum reviews in flight at once (without --batch)"
+    )
+    
+    parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Log progress messages too (default: warnings and errors only, or LOG_LEVEL)"
+    )
     
     args = parser.parse_args()
+    if args.verbose:
+        logging.getLogger().setLevel(logging.INFO)
+    
+    if args.brands_manifest is None and not (
+        args.generated_content and args.brand_profile and args.reference_content
+    ):
+        parser.error(
+            "--generated-content, --brand-profile and --reference-content are required "
+            "without --brands-manifest"
+        )
     
     try:
-        # Load inputs
-        with open(args.generated_content) as f:
-            generated = json.load(f)
+        # Every run is a list of jobs; a plain run is a list of one
+        if args.brands_manifest:
+            jobs = [
+                {
+                    "paths": (e["generated_content"], e["brand_profile"], e["reference_content"]),
+                    "output": e["output"]
+                }
+                for e in json.loads(Path(args.brands_manifest).read_bytes())
+            ]
+        else:
+            jobs = [{
+                "paths": (args.generated_content, args.brand_profile, args.reference_content),
+                "output": args.output
+            }]
         
-        with open(args.brand_profile) as f:
-            brand_profile = json.load(f)
+        # Load inputs; resolve what can be without an API call
+        reviews: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        pending = []
+        for i, job in enumerate(jobs):
+            job["inputs"] = tuple(json.loads(Path(path).read_bytes()) for path in job["paths"])
+            generated, brand_profile, references = job["inputs"]
+            
+            # Verbatim banned terms fail compliance outright; no need to ask Claude
+            review = prescreen_compliance(generated, brand_profile)
+            if review is not None:
+                logging.warning(f"Compliance pre-screen failed: {review['scores']['compliance']['issues']}")
+                reviews[i] = review
+                continue
+            
+            job["cache_path"] = review_cache_path(generated, brand_profile, references) if args.cache else None
+            if job["cache_path"] is not None:
+                review = load_cached_review(job["cache_path"])
+                if review is not None:
+                    logging.info(f"Using cached review: {job['cache_path']}")
+                    reviews[i] = review
+                    continue
+            
+            pending.append(i)
         
-        with open(args.reference_content) as f:
-            references = json.load(f)
+        # Score the rest with retry
+        if pending:
+            todo = [jobs[i] for i in pending]
+            if args.batch:
+                scored = review_all_batch(todo, args.retries)
+            else:
+                scored = asyncio.run(review_all(todo, args.retries, args.max_concurrency))
+            for i, review in zip(pending, scored):
+                if "error" not in review and jobs[i]["cache_path"] is not None:
+                    save_cached_review(jobs[i]["cache_path"], review)
+                reviews[i] = review
         
-        # Review with retry
-        for attempt in range(1, args.retries + 2):
-            try:
-                logging.info(f"Running quality review (attempt {attempt}/{args.retries + 1})")
-                
-                review = score_with_llm(generated, brand_profile, references)
-                
-                # Write output
-                with open(args.output, 'w') as f:
-                    json.dump(review, f, indent=2)
-                
+        failed = 0
+        for job, review in zip(jobs, reviews):
+            write_review(job["output"], review)
+            if "error" in review:
+                failed += 1
+            else:
                 logging.info(
                     f"Review complete: {review['overall_score']}/100 - {review['pass_fail']}"
                 )
-                print(json.dumps(review, indent=2))
-                return 0
-                
-            except Exception as e:
-                if attempt > args.retries:
-                    logging.error(f"Review failed after {attempt} attempts")
-                    # Return conservative FAIL default
-                    fail_result = {
-                        "scores": {
-                            "brand_voice": {"score": 0, "issues": ["Review failed"]},
-                            "compliance": {"score": 0, "issues": ["Review failed"]},
-                            "hashtags": {"score": 0, "issues": ["Review failed"]},
-                            "format": {"score": 0, "issues": ["Review failed"]},
-                            "claims": {"score": 0, "issues": ["Review failed"]}
-                        },
-                        "overall_score": 0,
-                        "pass_fail": "FAIL",
-                        "pass_criteria": {
-                            "overall_80": False,
-                            "compliance_100": False,
-                            "claims_100": False
-                        },
-                        "error": str(e)
-                    }
-                    with open(args.output, 'w') as f:
-                        json.dump(fail_result, f, indent=2)
-                    print(json.dumps(fail_result, indent=2))
-                    return 1
-                
-                logging.warning(f"Attempt {attempt} failed: {e}. Retrying...")
-                continue
+        
+        return 1 if failed else 0
         
     except FileNotFoundError as e:
         logging.error(f"Input file not found: {e}")
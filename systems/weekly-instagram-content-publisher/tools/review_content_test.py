@@ -0,0 +1,172 @@
+import json
+import unittest
+from unittest import mock
+
+import review_content
+from review_content import check_format, parse_review, prescreen_compliance, review_all_batch
+
+
+def reply(**overrides):
+    scores = {
+        "brand_voice": {"score": 90, "issues": []},
+        "compliance": {"score": 100, "issues": []},
+        "hashtags": {"score": 85, "issues": ["Post 2 uses generic hashtag #love"]},
+        "format": {"score": 95, "issues": []},
+        "claims": {"score": 100, "issues": []},
+    }
+    scores.update(overrides)
+    return json.dumps(scores)
+
+
+def post(post_id=1, **fields):
+    return {"post_id": post_id, "hook": "Hook", "caption": "Caption", "cta": "Shop now", **fields}
+
+
+class TestParseReview(unittest.TestCase):
+
+    def test_valid_reply(self):
+        review = parse_review(reply())
+        self.assertEqual(review["overall_score"], 94.0)
+        self.assertEqual(review["pass_fail"], "PASS")
+
+    def test_fenced_reply(self):
+        review = parse_review("```json\n" + reply() + "\n```")
+        self.assertEqual(review["pass_fail"], "PASS")
+
+    def test_compliance_below_100_fails(self):
+        review = parse_review(reply(compliance={"score": 95, "issues": ["Banned topic"]}))
+        self.assertEqual(review["pass_fail"], "FAIL")
+        self.assertFalse(review["pass_criteria"]["compliance_100"])
+
+    def test_local_format_replaces_model_score(self):
+        local = {"score": 90, "issues": ["Post 1: caption is 2201 chars (max 2200)"]}
+        review = parse_review(reply(format={"score": 0, "issues": []}), local)
+        self.assertEqual(review["scores"]["format"], local)
+        self.assertEqual(review["overall_score"], 93.0)
+
+    def test_extra_keys_dropped(self):
+        review = parse_review(reply(notes="looks fine"))
+        self.assertNotIn("notes", review["scores"])
+
+    def test_not_an_object(self):
+        with self.assertRaisesRegex(ValueError, "not a JSON object"):
+            parse_review("[90, 100, 85, 95, 100]")
+
+    def test_not_json(self):
+        with self.assertRaises(ValueError):
+            parse_review("Here is my review: all good")
+
+    def test_missing_dimension(self):
+        scores = json.loads(reply())
+        del scores["claims"]
+        with self.assertRaisesRegex(ValueError, "Missing dimension: claims"):
+            parse_review(json.dumps(scores))
+
+    def test_string_score(self):
+        with self.assertRaisesRegex(ValueError, "Invalid score for hashtags"):
+            parse_review(reply(hashtags={"score": "85", "issues": []}))
+
+    def test_bool_score(self):
+        with self.assertRaisesRegex(ValueError, "Invalid score for claims"):
+            parse_review(reply(claims={"score": True, "issues": []}))
+
+    def test_score_out_of_range(self):
+        with self.assertRaisesRegex(ValueError, "Invalid score for brand_voice"):
+            parse_review(reply(brand_voice={"score": 120, "issues": []}))
+
+    def test_issues_not_a_list(self):
+        with self.assertRaisesRegex(ValueError, "Invalid issues for compliance"):
+            parse_review(reply(compliance={"score": 100, "issues": "none"}))
+
+
+class TestCheckFormat(unittest.TestCase):
+
+    def test_within_limits(self):
+        self.assertIsNone(check_format({"posts": [post(caption="x" * 2200, hook="y" * 125)]}))
+
+    def test_caption_over_limit(self):
+        result = check_format({"posts": [post(caption="x" * 2201)]})
+        self.assertEqual(result["score"], 90)
+        self.assertEqual(result["issues"], ["Post 1: caption is 2201 chars (max 2200)"])
+
+    def test_each_violation_costs_points(self):
+        result = check_format({"posts": [
+            post(1, hook="y" * 126, alt_text="z" * 101),
+            post(2, caption="x" * 3000),
+        ]})
+        self.assertEqual(result["score"], 70)
+        self.assertEqual(len(result["issues"]), 3)
+
+    def test_failed_posts_ignored(self):
+        self.assertIsNone(check_format({"posts": [post(caption="x" * 3000, status="failed")]}))
+
+
+class TestPrescreenCompliance(unittest.TestCase):
+
+    brand = {"banned_topics": ["politics"], "prohibited_claims": ["cure", "miracle"]}
+
+    def test_no_terms(self):
+        self.assertIsNone(prescreen_compliance({"posts": [post(caption="A miracle cure")]}, {}))
+
+    def test_clean_posts(self):
+        self.assertIsNone(prescreen_compliance({"posts": [post()]}, self.brand))
+
+    def test_whole_words_only(self):
+        content = {"posts": [post(caption="Secure checkout, curated picks")]}
+        self.assertIsNone(prescreen_compliance(content, self.brand))
+
+    def test_banned_terms_fail(self):
+        content = {"posts": [
+            post(1, hook="A MIRACLE in a jar", caption="The cure you need"),
+            post(2),
+            post(3, cta="Talk politics with us"),
+        ]}
+        review = prescreen_compliance(content, self.brand)
+        self.assertEqual(review["pass_fail"], "FAIL")
+        self.assertTrue(review["prescreen"])
+        self.assertEqual(review["scores"]["compliance"]["issues"], [
+            "Post 1 contains banned term(s): cure, miracle",
+            "Post 3 contains banned term(s): politics",
+        ])
+
+    def test_failed_posts_ignored(self):
+        content = {"posts": [post(caption="A miracle", status="failed")]}
+        self.assertIsNone(prescreen_compliance(content, self.brand))
+
+
+class TestReviewAllBatch(unittest.TestCase):
+
+    brand = {"brand_name": "Acme", "tone": "friendly", "target_audience": "makers"}
+
+    def job(self, output, posts):
+        return {"output": output, "inputs": ({"posts": posts}, self.brand, {})}
+
+    def test_bad_job_fails_alone(self):
+        jobs = [
+            self.job("a.json", [post(type="carousel")]),
+            self.job("b.json", [post()]),  # no "type": the prompt can't be built
+            self.job("c.json", [post(type="reel")]),
+        ]
+        submitted = []
+
+        def fake_batch(requests):
+            submitted.append([custom_id for custom_id, _, _ in requests])
+            return {custom_id: parse_review(reply()) for custom_id, _, _ in requests}
+
+        with mock.patch.object(review_content, "score_with_llm_batch", fake_batch):
+            reviews = review_all_batch(jobs, retries=1)
+
+        self.assertEqual(len(submitted), 1)
+        self.assertEqual(len(submitted[0]), 2)
+        self.assertEqual([r["pass_fail"] for r in reviews], ["PASS", "FAIL", "PASS"])
+        self.assertIn("type", reviews[1]["error"])
+
+    def test_all_jobs_bad(self):
+        with mock.patch.object(review_content, "score_with_llm_batch") as fake_batch:
+            reviews = review_all_batch([self.job("a.json", [post()])], retries=1)
+        fake_batch.assert_not_called()
+        self.assertEqual(reviews[0]["pass_fail"], "FAIL")
+
+
+if __name__ == "__main__":
+    unittest.main()
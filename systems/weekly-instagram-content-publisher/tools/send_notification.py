@@ -1,22 +1,27 @@
 #!/usr/bin/env python3
 """
-Send notification to GitHub Issue or Slack.
+Send notification to GitHub Issue, Slack, or stdout (any combination).
 """
 
 import argparse
-import json
+import asyncio
 import logging
 import os
 import sys
+from typing import List
 
-logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+LOG_LEVEL = logging.getLevelName(os.environ.get("LOG_LEVEL", "WARNING").upper())
+logging.basicConfig(
+    level=LOG_LEVEL if isinstance(LOG_LEVEL, int) else logging.WARNING,
+    format="%(levelname)s: %(message)s"
+)
 
+TARGETS = ("github", "slack", "stdout")
 
-def send_github_comment(issue_number: str, summary: str) -> bool:
+
+async def send_github_comment(client, issue_number: str, summary: str) -> bool:
     """Post comment on GitHub Issue."""
     try:
-        import httpx
-        
         token = os.environ.get("GITHUB_TOKEN")
         repo = os.environ.get("GITHUB_REPOSITORY", "owner/repo")
         
@@ -30,7 +35,7 @@ def send_github_comment(issue_number: str, summary: str) -> bool:
             "Accept": "application/vnd.github.v3+json"
         }
         
-        resp = httpx.post(url, headers=headers, json={"body": summary}, timeout=15)
+        resp = await client.post(url, headers=headers, json={"body": summary})
         resp.raise_for_status()
         
         logging.info(f"GitHub comment posted on issue #{issue_number}")
@@ -41,18 +46,16 @@ def send_github_comment(issue_number: str, summary: str) -> bool:
         return False
 
 
-def send_slack_message(channel: str, summary: str) -> bool:
+async def send_slack_message(client, channel: str, summary: str) -> bool:
     """Send Slack message."""
     try:
-        import httpx
-        
         webhook_url = os.environ.get("SLACK_WEBHOOK_URL")
         
         if not webhook_url:
             logging.error("SLACK_WEBHOOK_URL not set")
             return False
         
-        resp = httpx.post(webhook_url, json={"text": summary}, timeout=10)
+        resp = await client.post(webhook_url, json={"text": summary}, timeout=10)
         resp.raise_for_status()
         
         logging.info("Slack notification sent")
@@ -63,30 +66,64 @@ def send_slack_message(channel: str, summary: str) -> bool:
         return False
 
 
+async def send_remote(targets: List[str], args: argparse.Namespace) -> List[bool]:
+    """
+    Send to the GitHub/Slack targets concurrently over one HTTP/2 client.
+    httpx is imported here so the stdout target (the workflow default)
+    doesn't pay for it at startup.
+    """
+    import httpx
+    
+    async with httpx.AsyncClient(http2=True, timeout=httpx.Timeout(15.0)) as client:
+        sends = {
+            "github": lambda: send_github_comment(client, args.issue_number, args.summary),
+            "slack": lambda: send_slack_message(client, args.channel or "general", args.summary),
+        }
+        return await asyncio.gather(*(sends[t]() for t in targets))
+
+
 def main():
     parser = argparse.ArgumentParser(description="Send notification")
     parser.add_argument("--summary", required=True)
-    parser.add_argument("--target", choices=["github", "slack", "stdout"], default="stdout")
+    parser.add_argument(
+        "--target",
+        default="stdout",
+        help="Comma-separated targets: github, slack, stdout (default: stdout)"
+    )
     parser.add_argument("--issue-number", help="GitHub issue number (for github target)")
     parser.add_argument("--channel", help="Slack channel (for slack target)")
+    parser.add_argument(
+        "--require-all",
+        action="store_true",
+        help="Fail if any target fails (default: only if every target fails)"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress messages too")
     
     args = parser.parse_args()
+    if args.verbose:
+        logging.getLogger().setLevel(logging.INFO)
+    
+    targets = list(dict.fromkeys(t.strip() for t in args.target.split(",") if t.strip()))
+    unknown = [t for t in targets if t not in TARGETS]
+    if unknown or not targets:
+        parser.error(f"--target must be a comma-separated list of {', '.join(TARGETS)}")
     
     try:
-        if args.target == "github":
-            if not args.issue_number:
-                logging.error("--issue-number required for github target")
-                return 1
-            success = send_github_comment(args.issue_number, args.summary)
-            return 0 if success else 1
-        
-        elif args.target == "slack":
-            success = send_slack_message(args.channel or "general", args.summary)
-            return 0 if success else 1
+        if "github" in targets and not args.issue_number:
+            logging.error("--issue-number required for github target")
+            return 1
         
-        else:  # stdout
+        results = []
+        if "stdout" in targets:
             print(args.summary)
-            return 0
+            results.append(True)
+        
+        remote = [t for t in targets if t != "stdout"]
+        if remote:
+            results += asyncio.run(send_remote(remote, args))
+        
+        ok = all(results) if args.require_all else any(results)
+        return 0 if ok else 1
         
     except Exception as e:
         logging.error(f"Notification failed: {e}")
@@ -8,11 +8,16 @@ Creates dated output directory with subdirectories for various output types.
 import argparse
 import json
 import logging
+import os
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
-logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+LOG_LEVEL = logging.getLevelName(os.environ.get("LOG_LEVEL", "WARNING").upper())
+logging.basicConfig(
+    level=LOG_LEVEL if isinstance(LOG_LEVEL, int) else logging.WARNING,
+    format="%(levelname)s: %(message)s"
+)
 
 
 def main():
@@ -30,30 +35,40 @@ def main():
         help="Date for output directory (YYYY-MM-DD, default: today)"
     )
     
+    parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Log progress messages too (default: warnings and errors only, or LOG_LEVEL)"
+    )
+    
     args = parser.parse_args()
+    if args.verbose:
+        logging.getLogger().setLevel(logging.INFO)
     
     try:
         # Determine output date
         if args.date:
             output_date = args.date
         else:
-            output_date = datetime.utcnow().strftime("%Y-%m-%d")
+            output_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         
         # Create output directory
         base = Path(args.base_path)
         output_dir = base / output_date
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Create subdirectories if needed
-        subdirs = ["logs", "temp"]
-        for subdir in subdirs:
-            (output_dir / subdir).mkdir(exist_ok=True)
-        
-        # Check if directory already exists (overwrite scenario)
-        if any(output_dir.iterdir()):
+        # Check if directory already had contents (overwrite scenario),
+        # before the subdirectories below make it non-empty regardless
+        with os.scandir(output_dir) as entries:
+            non_empty = next(entries, None) is not None
+        if non_empty:
             logging.warning(f"Output directory already exists: {output_dir}")
             logging.warning("Existing files may be overwritten")
         
+        # Create subdirectories if needed
+        for subdir in ("logs", "temp"):
+            os.makedirs(output_dir / subdir, exist_ok=True)
+        
         result = {
             "output_dir": str(output_dir.resolve()),
             "date": output_date,
@@ -61,7 +76,7 @@ def main():
         }
         
         logging.info(f"Output directory initialized: {output_dir}")
-        print(json.dumps(result, indent=2))
+        print(json.dumps(result, separators=(",", ":")))
         return 0
         
     except Exception as e:
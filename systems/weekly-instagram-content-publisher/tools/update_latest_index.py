@@ -6,11 +6,41 @@ Update latest.md with links to current content pack.
 import argparse
 import json
 import logging
+import os
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
-logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+LOG_LEVEL = logging.getLevelName(os.environ.get("LOG_LEVEL", "WARNING").upper())
+logging.basicConfig(
+    level=LOG_LEVEL if isinstance(LOG_LEVEL, int) else logging.WARNING,
+    format="%(levelname)s: %(message)s"
+)
+
+# The checklist is skipped when no post generated successfully, so it is
+# only linked when the file exists
+CHECKLIST_LINK = "- [Upload Checklist](./{date}/upload_checklist_{date}.md)\n"
+
+LATEST_TEMPLATE = """# Latest Instagram Content Pack
+
+**Generated:** {generated}
+**Theme:** {theme}
+**Quality Score:** {score}/100
+**Status:** {status}
+
+## Files
+
+- [Content Pack (Markdown)](./{date}/content_pack_{date}.md)
+- [Content Pack (JSON)](./{date}/content_pack_{date}.json)
+- [Review Report](./{date}/review_report.json)
+{checklist_link}
+## Quick Stats
+
+- **Date:** {date}
+- **Theme:** {theme}
+- **Score:** {score}/100
+- **Status:** {status}
+"""
 
 
 def main():
@@ -19,40 +49,39 @@ def main():
     parser.add_argument("--weekly-theme", required=True)
     parser.add_argument("--review-score", type=float, required=True)
     parser.add_argument("--publish-status", required=True)
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress messages too")
     
     args = parser.parse_args()
+    if args.verbose:
+        logging.getLogger().setLevel(logging.INFO)
     
     try:
         output_dir = Path(args.output_dir)
-        date_str = datetime.utcnow().strftime("%Y-%m-%d")
+        now = datetime.now(timezone.utc)
+        date_str = now.strftime("%Y-%m-%d")
         
-        latest = f"""# Latest Instagram Content Pack
-
-**Generated:** {datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")}
-**Theme:** {args.weekly_theme}
-**Quality Score:** {args.review_score}/100
-**Status:** {args.publish_status}
-
-## Files
-
-- [Content Pack (Markdown)](./{date_str}/content_pack_{date_str}.md)
-- [Content Pack (JSON)](./{date_str}/content_pack_{date_str}.json)
-- [Review Report](./{date_str}/review_report.json)
-- [Upload Checklist](./{date_str}/upload_checklist_{date_str}.md)
-
-## Quick Stats
-
-- **Date:** {date_str}
-- **Theme:** {args.weekly_theme}
-- **Score:** {args.review_score}/100
-- **Status:** {args.publish_status}
-"""
+        checklist_link = ""
+        if (output_dir / f"upload_checklist_{date_str}.md").is_file():
+            checklist_link = CHECKLIST_LINK.format(date=date_str)
+        
+        latest = LATEST_TEMPLATE.format_map({
+            "checklist_link": checklist_link,
+            "generated": now.strftime("%Y-%m-%d %H:%M UTC"),
+            "date": date_str,
+            "theme": args.weekly_theme,
+            "score": args.review_score,
+            "status": args.publish_status,
+        })
         
+        # Write beside the target and rename over it, so readers never see
+        # a half-written file
         latest_path = output_dir.parent / "latest.md"
-        latest_path.write_text(latest)
+        tmp_path = latest_path.with_suffix(".md.tmp")
+        tmp_path.write_text(latest)
+        os.replace(tmp_path, latest_path)
         
         logging.info(f"Latest index updated: {latest_path}")
-        print(json.dumps({"path": str(latest_path)}, indent=2))
+        print(json.dumps({"path": str(latest_path)}))
         return 0
         
     except Exception as e:
@@ -15,47 +15,93 @@ Outputs: validated_inputs.json with parsed and validated data
 import argparse
 import json
 import logging
+import os
+import re
 import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
-logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+from jsonschema import Draft7Validator
 
+LOG_LEVEL = logging.getLevelName(os.environ.get("LOG_LEVEL", "WARNING").upper())
+logging.basicConfig(
+    level=LOG_LEVEL if isinstance(LOG_LEVEL, int) else logging.WARNING,
+    format="%(levelname)s: %(message)s"
+)
 
-def validate_brand_profile(profile: Dict[str, Any]) -> None:
-    """Validate brand profile has all required fields."""
-    required = [
+# http(s) URL with no whitespace, quotes or angle brackets, at most 2048 chars
+URL_RE = re.compile(r"https?://[^\s<>\"]{1,2048}")
+
+POST_TYPES = ("reels", "carousels", "single_images", "stories")
+
+BRAND_PROFILE_SCHEMA = {
+    "type": "object",
+    "required": [
         "brand_name", "tone", "target_audience", "products",
         "banned_topics", "prohibited_claims", "preferred_cta",
         "emoji_style", "hashtag_preferences"
+    ],
+    "properties": {
+        "hashtag_preferences": {"type": "object", "required": ["count"]}
+    }
+}
+
+# Counts are non-negative integers; validate_post_plan checks their total
+POST_PLAN_SCHEMA = {
+    "type": "object",
+    "properties": {t: {"type": "integer", "minimum": 0} for t in POST_TYPES}
+}
+
+# Validators are built once at import rather than per call
+BRAND_PROFILE_VALIDATOR = Draft7Validator(BRAND_PROFILE_SCHEMA)
+POST_PLAN_VALIDATOR = Draft7Validator(POST_PLAN_SCHEMA)
+
+
+def schema_errors(validator: Draft7Validator, instance: Any) -> List[str]:
+    """All schema violations in instance, as 'path: message' strings."""
+    return [
+        f"{'.'.join(map(str, e.absolute_path)) or '(root)'}: {e.message}"
+        for e in sorted(validator.iter_errors(instance), key=lambda e: list(e.absolute_path))
     ]
-    missing = [f for f in required if f not in profile]
-    if missing:
-        raise ValueError(f"Missing required fields in brand_profile: {', '.join(missing)}")
-    
-    # Validate hashtag_preferences structure
-    if "hashtag_preferences" in profile:
-        hp = profile["hashtag_preferences"]
-        if not isinstance(hp, dict):
-            raise ValueError("hashtag_preferences must be a dictionary")
-        if "count" not in hp:
-            raise ValueError("hashtag_preferences missing 'count' field")
+
+
+def validate_brand_profile(profile: Dict[str, Any]) -> None:
+    """Validate brand profile has all required fields."""
+    errors = schema_errors(BRAND_PROFILE_VALIDATOR, profile)
+    if errors:
+        raise ValueError(f"Invalid brand_profile: {'; '.join(errors)}")
     
     logging.info(f"Brand profile validated: {profile['brand_name']}")
 
 
 def validate_post_plan(plan: Dict[str, Any]) -> None:
     """Validate post plan structure."""
-    valid_types = ["reels", "carousels", "single_images", "stories"]
-    has_posts = any(plan.get(t, 0) > 0 for t in valid_types)
+    errors = schema_errors(POST_PLAN_VALIDATOR, plan)
+    if errors:
+        raise ValueError(f"Invalid post_plan: {'; '.join(errors)}")
     
-    if not has_posts:
+    # One pass gives both the total and whether there is anything to post
+    total = sum(plan.get(t, 0) for t in POST_TYPES)
+    if total == 0:
         raise ValueError("post_plan must specify at least one post type with count > 0")
     
-    total = sum(plan.get(t, 0) for t in valid_types)
     logging.info(f"Post plan validated: {total} total posts")
 
 
+def validate_reference_links(links: Any) -> None:
+    """Validate reference links: URL strings or {url, purpose} objects."""
+    if not isinstance(links, list):
+        raise ValueError("reference_links must be a JSON array")
+    
+    bad = []
+    for link in links:
+        url = link.get("url") if isinstance(link, dict) else link
+        if not isinstance(url, str) or not URL_RE.fullmatch(url):
+            bad.append(link)
+    if bad:
+        raise ValueError(f"Invalid reference URLs: {bad[:3]}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate Instagram content generation inputs"
@@ -92,7 +138,15 @@ def main():
         help="Output file path"
     )
     
+    parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Log progress messages too (default: warnings and errors only, or LOG_LEVEL)"
+    )
+    
     args = parser.parse_args()
+    if args.verbose:
+        logging.getLogger().setLevel(logging.INFO)
     
     try:
         # Load and validate brand profile
@@ -100,7 +154,7 @@ def main():
         if not brand_path.exists():
             raise FileNotFoundError(f"Brand profile not found: {brand_path}")
         
-        brand_profile = json.loads(brand_path.read_text())
+        brand_profile = json.loads(brand_path.read_bytes())
         validate_brand_profile(brand_profile)
         
         # Parse and validate post plan
@@ -109,8 +163,7 @@ def main():
         
         # Parse reference links
         reference_links = json.loads(args.reference_links)
-        if not isinstance(reference_links, list):
-            raise ValueError("reference_links must be a JSON array")
+        validate_reference_links(reference_links)
         
         # Validate publishing mode (already validated by argparse choices)
         
@@ -128,10 +181,10 @@ def main():
         # Write output
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(json.dumps(output, indent=2))
+        output_path.write_bytes(json.dumps(output, indent=2).encode("utf-8"))
         
         logging.info(f"Inputs validated successfully. Output: {output_path}")
-        print(json.dumps(output, indent=2))
+        print(json.dumps(output, separators=(",", ":")))
         return 0
         
     except FileNotFoundError as e:
@@ -0,0 +1,43 @@
+import unittest
+
+from validate_inputs import validate_reference_links
+
+
+class TestValidateReferenceLinks(unittest.TestCase):
+
+    def test_url_strings(self):
+        validate_reference_links(["https://example.com/a?b=1", "http://example.org"])
+
+    def test_url_objects(self):
+        """The {url, purpose} form documented in CLAUDE.md"""
+        validate_reference_links([
+            {"url": "https://example.com/product", "purpose": "product details"},
+            "https://example.com/blog",
+        ])
+
+    def test_empty_list(self):
+        validate_reference_links([])
+
+    def test_malformed_url_string(self):
+        with self.assertRaisesRegex(ValueError, "Invalid reference URLs"):
+            validate_reference_links(["ftp://example.com", "http://exa mple.com"])
+
+    def test_malformed_url_object(self):
+        with self.assertRaisesRegex(ValueError, "Invalid reference URLs"):
+            validate_reference_links([{"url": "example.com", "purpose": "no scheme"}])
+
+    def test_object_without_url(self):
+        with self.assertRaisesRegex(ValueError, "Invalid reference URLs"):
+            validate_reference_links([{"purpose": "missing url"}])
+
+    def test_other_types(self):
+        with self.assertRaisesRegex(ValueError, "Invalid reference URLs"):
+            validate_reference_links([5])
+
+    def test_not_a_list(self):
+        with self.assertRaisesRegex(ValueError, "must be a JSON array"):
+            validate_reference_links({"url": "https://example.com"})
+
+
+if __name__ == "__main__":
+    unittest.main()